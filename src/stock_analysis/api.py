@@ -1,46 +1,94 @@
 from __future__ import annotations
 
+import asyncio
+import os
 from datetime import date
+from typing import Annotated, Any, Callable, Dict, List, Literal, Type
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Body, Depends, FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
 
-from .engine import OptionEngine
+from .dates import parse_ymd
+from .engine import OptionEngine, Right
+
+app = FastAPI(
+    title="Stock Analysis API",
+    version="0.1.0",
+    servers=[{"url": os.environ.get("STOCK_ANALYSIS_SERVER_URL", "https://getdata-uufz.onrender.com")}],
+    default_response_class=ORJSONResponse,
+)
+# The engine caps concurrent Nasdaq fetches (STOCK_ANALYSIS_UPSTREAM_LIMIT, default 8); cache
+# hits and scoring are not gated.
+engine = OptionEngine(
+    score_workers=os.cpu_count() or 1,
+    upstream_limit=int(os.environ.get("STOCK_ANALYSIS_UPSTREAM_LIMIT", "8")),
+)
+
+
+async def _run(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    # Blocking engine calls run off the event loop.
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def _ymd(value: Any) -> Any:
+    # Strings go through the memoized parse_ymd; its ValueError surfaces as a regular 422.
+    return parse_ymd(value) if isinstance(value, str) else value
+
+
+# A date for OpenAPI and validation purposes, parsed by parse_ymd instead of pydantic's parser.
+_Ymd = Annotated[date, BeforeValidator(_ymd)]
+
+
+def _asof_param(
+    asof: Annotated[_Ymd | None, Query(description="As-of date for T (YYYY-MM-DD); default today")] = None,
+) -> date:
+    return asof or date.today()
+
+
+def _expiry_param(expiry: Annotated[_Ymd, Query(description="Option expiry date (YYYY-MM-DD)")]) -> date:
+    return expiry
+
+
+def _optional_expiry_param(
+    expiry: Annotated[_Ymd | None, Query(description="Option expiry date (YYYY-MM-DD); default nearest")] = None,
+) -> date | None:
+    return expiry
 
-app = FastAPI(title="Stock Analysis API", version="0.1.0", servers=[{"url": "https://getdata-uufz.onrender.com"}])
-engine = OptionEngine()
 
 @app.get("/")
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
 @app.get("/price")
-def get_price(ticker: str = Query(..., description="Ticker symbol, e.g. META")):
+async def get_price(ticker: str = Query(..., description="Ticker symbol, e.g. META")):
     try:
-        return engine.get_latest_price(ticker)
+        return await _run(engine.get_latest_price, ticker)
     except Exception as e:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/delta-strike")
-def delta_strike(
+async def delta_strike(
     ticker: str = Query(...),
     spot: float = Query(..., description="Underlying spot price"),
-    expiry: date = Query(..., description="Option expiry date (YYYY-MM-DD)"),
-    right: str = Query("put", description="Option right: put or call"),
+    expiry: date = Depends(_expiry_param),
+    right: Literal["put", "call"] = Query("put", description="Option right: put or call"),
     target_delta: float = Query(-0.20, description="Target option delta (put typically negative, call positive)"),
-    asof: date = Query(default_factory=date.today, description="As-of date for T (YYYY-MM-DD)"),
+    asof: date = Depends(_asof_param),
     r: float = Query(0.0, description="Risk-free rate (annualized)"),
     q: float = Query(0.0, description="Dividend yield (annualized)"),
 ):
     try:
-        return engine.find_strike_for_delta(
+        return await _run(
+            engine.find_strike_for_delta,
             ticker=ticker,
             expiry=expiry,
             target_delta=target_delta,
             asof=asof,
-            right=right,
+            right=Right.PUT if right == "put" else Right.CALL,
             spot=spot,
             r=r,
             q=q,
@@ -50,22 +98,23 @@ def delta_strike(
 
 
 @app.get("/strike-premium")
-def strike_premium(
+async def strike_premium(
     ticker: str = Query(...),
-    right: str = Query("put", description="Option right: put or call"),
+    right: Literal["put", "call"] = Query("put", description="Option right: put or call"),
     target_delta: float = Query(..., description="Target option delta (put typically negative, call positive)"),
-    expiry: date | None = Query(None, description="Option expiry date (YYYY-MM-DD); default nearest"),
-    asof: date = Query(default_factory=date.today, description="As-of date for T (YYYY-MM-DD)"),
+    expiry: date | None = Depends(_optional_expiry_param),
+    asof: date = Depends(_asof_param),
     spot: float | None = Query(None, description="Override spot price"),
     r: float = Query(0.0),
     q: float = Query(0.0),
 ):
     try:
-        return engine.strike_and_premium_for_delta_right(
+        return await _run(
+            engine.strike_and_premium_for_delta_right,
             ticker=ticker,
             target_delta=target_delta,
             asof=asof,
-            right=right,
+            right=Right.PUT if right == "put" else Right.CALL,
             expiry=expiry,
             spot=spot,
             r=r,
@@ -76,22 +125,23 @@ def strike_premium(
 
 
 @app.get("/option-premium")
-def option_premium(
+async def option_premium(
     ticker: str = Query(...),
-    expiry: date = Query(..., description="Option expiry date (YYYY-MM-DD)"),
+    expiry: date = Depends(_expiry_param),
     strike: float = Query(..., description="Option strike"),
-    right: str = Query("put", description="Option right: put or call"),
-    asof: date = Query(default_factory=date.today, description="As-of date for T (YYYY-MM-DD)"),
+    right: Literal["put", "call"] = Query("put", description="Option right: put or call"),
+    asof: date = Depends(_asof_param),
     spot: float | None = Query(None, description="Override spot price"),
     r: float = Query(0.0),
     q: float = Query(0.0),
 ):
     try:
-        return engine.get_option_premium(
+        return await _run(
+            engine.get_option_premium,
             ticker=ticker,
             expiry=expiry,
             strike=strike,
-            right=right,
+            right=Right.PUT if right == "put" else Right.CALL,
             asof=asof,
             spot=spot,
             r=r,
@@ -102,10 +152,10 @@ def option_premium(
 
 
 @app.get("/covered-call")
-def covered_call(
+async def covered_call(
     ticker: str = Query(...),
-    expiry: date = Query(..., description="Option expiry date (YYYY-MM-DD)"),
-    asof: date = Query(default_factory=date.today, description="As-of date for T (YYYY-MM-DD)"),
+    expiry: date = Depends(_expiry_param),
+    asof: date = Depends(_asof_param),
     spot: float | None = Query(None, description="Override spot price"),
     strike: float | None = Query(None, description="Call strike; if omitted, pick from target_delta"),
     target_delta: float = Query(0.20, description="Target call delta (positive), used if strike omitted"),
@@ -114,7 +164,8 @@ def covered_call(
     q: float = Query(0.0),
 ):
     try:
-        return engine.covered_call(
+        return await _run(
+            engine.covered_call,
             ticker=ticker,
             expiry=expiry,
             asof=asof,
@@ -129,6 +180,100 @@ def covered_call(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+class BatchItem(BaseModel):
+    op: Literal["price", "delta_strike", "strike_premium", "option_premium", "covered_call"]
+    params: Dict[str, Any] = Field(default_factory=dict, description="Same names as the matching GET endpoint's query params")
+
+
+# One params model per batch op, mirroring that op's GET query params. Unknown keys are rejected so
+# a batch item cannot reach engine-only arguments (e.g. a caller-supplied chain).
+class _BatchParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class _PriceParams(_BatchParams):
+    ticker: str
+
+
+class _DeltaStrikeParams(_BatchParams):
+    ticker: str
+    spot: float
+    expiry: _Ymd
+    right: Literal["put", "call"] = "put"
+    target_delta: float = -0.20
+    asof: _Ymd = Field(default_factory=date.today)
+    r: float = 0.0
+    q: float = 0.0
+
+
+class _StrikePremiumParams(_BatchParams):
+    ticker: str
+    right: Literal["put", "call"] = "put"
+    target_delta: float
+    expiry: _Ymd | None = None
+    asof: _Ymd = Field(default_factory=date.today)
+    spot: float | None = None
+    r: float = 0.0
+    q: float = 0.0
+
+
+class _OptionPremiumParams(_BatchParams):
+    ticker: str
+    expiry: _Ymd
+    strike: float
+    right: Literal["put", "call"] = "put"
+    asof: _Ymd = Field(default_factory=date.today)
+    spot: float | None = None
+    r: float = 0.0
+    q: float = 0.0
+
+
+class _CoveredCallParams(_BatchParams):
+    ticker: str
+    expiry: _Ymd
+    asof: _Ymd = Field(default_factory=date.today)
+    spot: float | None = None
+    strike: float | None = None
+    target_delta: float = 0.20
+    shares: int = 100
+    r: float = 0.0
+    q: float = 0.0
+
+
+_BATCH_OPS: Dict[str, tuple[Type[_BatchParams], Callable[..., Dict[str, Any]]]] = {
+    "price": (_PriceParams, engine.get_latest_price),
+    "delta_strike": (_DeltaStrikeParams, engine.find_strike_for_delta),
+    "strike_premium": (_StrikePremiumParams, engine.strike_and_premium_for_delta_right),
+    "option_premium": (_OptionPremiumParams, engine.get_option_premium),
+    "covered_call": (_CoveredCallParams, engine.covered_call),
+}
+
+
+def _dispatch(item: BatchItem) -> Dict[str, Any]:
+    model, fn = _BATCH_OPS[item.op]
+    params = dict(model.model_validate(item.params))
+    if "right" in params:
+        params["right"] = Right.parse(params["right"])
+    return fn(**params)
+
+
+async def _run_batch_item(item: BatchItem) -> Dict[str, Any]:
+    try:
+        return await _run(_dispatch, item)
+    except Exception as e:  # noqa: BLE001
+        return {"error": str(e)}
+
+
+_BATCH_MAX_ITEMS = 50
+
+
+@app.post("/batch")
+async def batch(items: Annotated[List[BatchItem], Body(max_length=_BATCH_MAX_ITEMS)]):
+    # Items run concurrently and share the engine's spot/chain caches, so lookups on the same
+    # ticker/expiry collapse to one Nasdaq fetch. A failing item does not fail the batch.
+    return await asyncio.gather(*(_run_batch_item(it) for it in items))
+
+
 def main() -> None:
     import uvicorn
 
@@ -1,18 +1,42 @@
 from __future__ import annotations
 
 import argparse
-import json
 from dataclasses import asdict
 from datetime import date as _date
 
+import orjson
+
 from .dates import parse_ymd
-from .engine import OptionEngine
-from .sources.nasdaq import Nasdaq
-from .sources.yahoo_finance import YahooFinance
+
+
+# Data sources and the engine pull in requests; import them only for the command that needs
+# them so --help and argparse errors don't pay for it.
+def _nasdaq():
+    from .sources.nasdaq import Nasdaq
+
+    return Nasdaq()
+
+
+def _yahoo():
+    from .sources.yahoo_finance import YahooFinance
+
+    return YahooFinance()
+
+
+def _engine():
+    from .engine import OptionEngine
+
+    return OptionEngine(nasdaq=_nasdaq())
+
+
+def _right(value: str):
+    from .engine import Right
+
+    return Right.parse(value)
 
 
 def _json_print(obj) -> None:
-    print(json.dumps(obj, indent=2, sort_keys=True, default=str))
+    print(orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode())
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -103,11 +127,10 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main(argv: list[str] | None = None) -> int:
     args = build_parser().parse_args(argv)
-    yahoo = YahooFinance()
-    nasdaq = Nasdaq()
-    engine = OptionEngine(nasdaq=nasdaq)
 
     if args.cmd == "case":
+        yahoo = _yahoo()
+        nasdaq = _nasdaq()
         ticker = args.ticker
         trading_date = parse_ymd(args.date)
         expiry = parse_ymd(args.expiry)
@@ -140,7 +163,7 @@ def main(argv: list[str] | None = None) -> int:
     if args.cmd == "close":
         if args.source != "yahoo":
             raise RuntimeError("close currently only supports --source yahoo")
-        q = yahoo.get_close_on_date(args.ticker, parse_ymd(args.date))
+        q = _yahoo().get_close_on_date(args.ticker, parse_ymd(args.date))
         _json_print(asdict(q))
         return 0
 
@@ -150,12 +173,13 @@ def main(argv: list[str] | None = None) -> int:
         asof = parse_ymd(args.asof) if args.asof else _date.today()
         if expiry <= asof:
             raise RuntimeError("expiry must be after asof")
+        engine = _engine()
         chosen = engine.find_strike_for_delta(
             ticker=ticker,
             expiry=expiry,
             target_delta=float(args.target_delta),
             asof=asof,
-            right=str(args.right),
+            right=_right(args.right),
             spot=args.spot,
             r=float(args.r),
             q=float(args.q),
@@ -176,12 +200,13 @@ def main(argv: list[str] | None = None) -> int:
         if expiry <= asof:
             raise RuntimeError("expiry must be after asof")
 
+        engine = _engine()
         chosen = engine.find_strike_for_delta(
             ticker=ticker,
             expiry=expiry,
             target_delta=float(args.target_delta),
             asof=asof,
-            right=str(args.right),
+            right=_right(args.right),
             spot=float(args.spot),
             r=float(args.r),
             q=float(args.q),
@@ -198,11 +223,12 @@ def main(argv: list[str] | None = None) -> int:
         asof = parse_ymd(args.asof) if args.asof else _date.today()
 
         expiry = parse_ymd(args.expiry) if args.expiry else None
+        engine = _engine()
         chosen = engine.strike_and_premium_for_delta_right(
             ticker=ticker,
             target_delta=float(args.target_delta),
             asof=asof,
-            right=str(args.right),
+            right=_right(args.right),
             expiry=expiry,
             spot=args.spot,
             r=float(args.r),
@@ -217,7 +243,7 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "call-premium":
-        c = nasdaq.get_call_premium(args.ticker, parse_ymd(args.expiry), args.strike)
+        c = _nasdaq().get_call_premium(args.ticker, parse_ymd(args.expiry), args.strike)
         _json_print(asdict(c))
         return 0
 
@@ -228,6 +254,7 @@ def main(argv: list[str] | None = None) -> int:
         if expiry <= asof:
             raise RuntimeError("expiry must be after asof")
 
+        engine = _engine()
         rep = engine.covered_call(
             ticker=ticker,
             expiry=expiry,
@@ -244,10 +271,10 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.cmd == "put-premium":
         if args.source == "nasdaq":
-            p = nasdaq.get_put_premium(args.ticker, parse_ymd(args.expiry), args.strike)
+            p = _nasdaq().get_put_premium(args.ticker, parse_ymd(args.expiry), args.strike)
             _json_print(asdict(p))
         else:
-            p = yahoo.get_put_premium(args.ticker, parse_ymd(args.expiry), args.strike)
+            p = _yahoo().get_put_premium(args.ticker, parse_ymd(args.expiry), args.strike)
             _json_print(asdict(p))
         return 0
 
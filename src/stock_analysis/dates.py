@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 from dateutil import tz
@@ -19,7 +20,9 @@ def to_epoch_seconds(dt: datetime) -> int:
     return int(dt.timestamp())
 
 
+@lru_cache(maxsize=4096)
 def parse_ymd(s: str) -> date:
+    # date is immutable, so repeated strings (today, the weekly/monthly expiries) can share one object.
     return date.fromisoformat(s)
 
 
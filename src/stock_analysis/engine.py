@@ -1,25 +1,303 @@
 from __future__ import annotations
 
+import math
+import threading
+from bisect import bisect_left, bisect_right
 from dataclasses import asdict
 from datetime import date
-from typing import Any, Dict, Optional
+from enum import IntEnum
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, NamedTuple, Optional, TypeVar
+
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from .options_math import (
-    BsInputs,
+    BsCtx,
+    _bs_call_delta_fast,
+    _bs_put_delta_fast,
+    _implied_vol_newton_fast,
     bs_call_delta,
     bs_put_delta,
-    implied_vol_call_bisect,
-    implied_vol_put_bisect,
+    implied_vol_call_newton,
+    implied_vol_put_newton,
 )
-from .sources.nasdaq import Nasdaq
+from .sources.nasdaq import Nasdaq, NasdaqCallPremium, NasdaqPutPremium
+
+_T = TypeVar("_T")
+
+
+class Right(IntEnum):
+    PUT = 0
+    CALL = 1
+
+    @classmethod
+    def parse(cls, value: "Right | str") -> "Right":
+        # Normalize once at the edge (CLI/API); engine code then branches on the enum.
+        if isinstance(value, Right):
+            return value
+        v = str(value).strip().lower()
+        if v == "put":
+            return cls.PUT
+        if v == "call":
+            return cls.CALL
+        raise ValueError("right must be 'put' or 'call'")
+
+    @property
+    def label(self) -> str:
+        return "put" if self is Right.PUT else "call"
+
+# Strikes outside +-3 sigma (at a 30% vol guess) around the forward are skipped on the first pass.
+_WINDOW_VOL = 0.30
+_WINDOW_SIGMAS = 3.0
+# Smaller chains are scored in-process; IPC would cost more than the solve.
+_PROCESS_MIN_ROWS = 64
+_NEAREST_EXPIRY_TTL_S = 300.0
+
+
+class _Pick(NamedTuple):
+    i: int  # index of the strike whose delta is closest to target
+    iv: float
+    delta: float
+    first_ok: int  # first/last index whose IV solved; tells the caller if the pick sits on the edge
+    last_ok: int
+
+
+@lru_cache(maxsize=None)
+def _vector_solver():
+    # numba and numpy/scipy are optional; prefer the JIT kernel, then the NumPy one,
+    # and fall back to the scalar loop when neither is installed.
+    try:
+        from .options_math_numba import solve_chain
+    except ImportError:
+        pass
+    else:
+        return solve_chain
+    try:
+        from .options_math_numpy import solve_chain
+    except ImportError:
+        return None
+    return solve_chain
+
+
+def _pick_vectorized(
+    solve, rows: list[Dict[str, Any]], ctx: BsCtx, right: Right, target_delta: float
+) -> Optional[_Pick]:
+    import numpy as np
+
+    if not rows:
+        return None
+    k = np.fromiter((float(row["strike"]) for row in rows), dtype=np.float64, count=len(rows))
+    mid = np.fromiter((float(row["mid"]) for row in rows), dtype=np.float64, count=len(rows))
+    i, iv, delta = solve(ctx.s, k, ctx.t, ctx.r, ctx.q, mid, target_delta, is_put=right is Right.PUT)
+    if i < 0:
+        return None
+    ok = np.flatnonzero(~np.isnan(iv))
+    return _Pick(i, float(iv[i]), float(delta[i]), int(ok[0]), int(ok[-1]))
+
+
+def _pick_scalar(rows: list[Dict[str, Any]], ctx: BsCtx, right: Right, target_delta: float) -> Optional[_Pick]:
+    # Strike-invariant terms come precomputed on ctx; only log(k) is per row.
+    is_put = right is Right.PUT
+    log_f, sqrt_t, disc_r, disc_q, pv_s = ctx.log_f, ctx.sqrt_t, ctx.disc_r, ctx.disc_q, ctx.pv_s
+    delta_fast = _bs_put_delta_fast if is_put else _bs_call_delta_fast
+
+    # Track only primitives during the scan; the caller builds the result dict for the winner.
+    best_diff: Optional[float] = None
+    best_i, best_iv, best_d = -1, 0.0, 0.0
+    first_ok = last_ok = -1
+    # No early exit: cent-rounded quotes and per-strike vol noise make solved deltas wiggle
+    # around the target, so neither a local rise nor a sign crossing proves nothing later wins.
+    # _pick_windowed already bounds the rows, so the full pass is cheap.
+    prev_iv: Optional[float] = None
+    for i, row in enumerate(rows):
+        k = float(row["strike"])
+        if k <= 0:
+            continue
+        log_fk = log_f - math.log(k)
+        iv = _implied_vol_newton_fast(log_fk, sqrt_t, pv_s, k * disc_r, float(row["mid"]), is_put, init=prev_iv)
+        if iv is None:
+            continue
+        if first_ok < 0:
+            first_ok = i
+        last_ok = i
+        prev_iv = iv
+
+        d = delta_fast(log_fk, sqrt_t, disc_q, iv)
+        diff = abs(d - target_delta)
+        if best_diff is None or diff < best_diff:
+            best_diff, best_i, best_iv, best_d = diff, i, iv, d
+
+    if best_diff is None:
+        return None
+    return _Pick(best_i, best_iv, best_d, first_ok, last_ok)
+
+
+def _pick_windowed(
+    pick: Callable[..., Optional[_Pick]],
+    rows: list[Dict[str, Any]],
+    ctx: BsCtx,
+    right: Right,
+    target_delta: float,
+) -> Optional[_Pick]:
+    # Heuristic band: solve only strikes within a few sigmas of the forward, where the usual
+    # target deltas live. Solved deltas wiggle with per-strike IVs, so this is not a proof of the
+    # global best; it relies on far strikes having deltas well away from the target. If the pick
+    # sits on the band's edge (the trend points outside it) or nothing solves, the band doubles
+    # and is re-solved, ending in a full scan of the chain once it covers every strike.
+    strikes = [float(row["strike"]) for row in rows]
+    n = len(rows)
+    log_f = ctx.log_f
+    half = _WINDOW_SIGMAS * _WINDOW_VOL * ctx.sqrt_t
+    while True:
+        lo = bisect_left(strikes, math.exp(log_f - half))
+        hi = bisect_right(strikes, math.exp(log_f + half))
+        best = pick(rows[lo:hi], ctx, right, target_delta) if lo < hi else None
+        grow_lo = lo > 0 and (best is None or best.i == best.first_ok)
+        grow_hi = hi < n and (best is None or best.i == best.last_ok)
+        if not (grow_lo or grow_hi):
+            if best is None:
+                return None
+            return _Pick(best.i + lo, best.iv, best.delta, best.first_ok + lo, best.last_ok + lo)
+        half *= 2.0
+
+
+def _score_chain(rows: list[Dict[str, Any]], ctx: BsCtx, right: Right, target_delta: float) -> Optional[_Pick]:
+    # Module-level so it can be shipped to a worker process.
+    solve = _vector_solver()
+    pick = partial(_pick_vectorized, solve) if solve is not None else _pick_scalar
+    return _pick_windowed(pick, rows, ctx, right, target_delta)
 
 
 class OptionEngine:
-    def __init__(self, *, nasdaq: Optional[Nasdaq] = None) -> None:
+    def __init__(
+        self,
+        *,
+        nasdaq: Optional[Nasdaq] = None,
+        cache_ttl_s: float = 5.0,
+        score_workers: int = 0,
+        upstream_limit: int = 8,
+    ) -> None:
         self._nasdaq = nasdaq or Nasdaq()
+        # Caps concurrent Nasdaq fetches across all threads using this engine. Only cache misses
+        # and uncached lookups take a slot; cache hits and scoring never wait on it.
+        self._upstream = threading.BoundedSemaphore(upstream_limit)
+        # With score_workers > 0 and no numba/numpy backend, large chains are scored in a process
+        # pool (created on first use) so the pure-Python solver doesn't serialize requests on the
+        # GIL. The vectorized backends are faster than the pickling round-trip, so they stay
+        # in-process, as does everything with 0.
+        self._score_workers = score_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Small thread pool for overlapping independent upstream fetches (e.g. spot + premium).
+        self._io: Optional[ThreadPoolExecutor] = None
+        # Short-lived memoization of Nasdaq fetches so back-to-back queries for the same
+        # ticker/expiry skip the HTTP round-trip. API handlers run on a threadpool, hence the lock.
+        self._cache_lock = threading.Lock()
+        self._spot_cache: TTLCache = TTLCache(maxsize=512, ttl=cache_ttl_s)
+        self._chain_cache: TTLCache = TTLCache(maxsize=512, ttl=cache_ttl_s)
+        # The nearest listed expiry only moves once a day, so it can be held much longer.
+        self._nearest_expiry_cache: TTLCache = TTLCache(maxsize=256, ttl=_NEAREST_EXPIRY_TTL_S)
+
+    def _score_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # spawn: forking a threaded server process is unsafe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._score_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _score_in_pool(self, *args: Any) -> Optional[_Pick]:
+        from concurrent.futures.process import BrokenProcessPool
+
+        pool = self._score_pool()
+        try:
+            return pool.submit(_score_chain, *args).result()
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash); drop the pool so the next call starts a fresh one
+            # and score this chain in-process.
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            return _score_chain(*args)
+
+    def _io_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._io is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._io = ThreadPoolExecutor(max_workers=8, thread_name_prefix="option-engine-io")
+            return self._io
+
+    def _spot_async(self, ticker: str, spot: float | None) -> Callable[[], float]:
+        # Starts the spot lookup in the background so it overlaps another fetch; call the result
+        # to wait for it. An explicit spot (or a cached one) costs nothing.
+        if spot is not None:
+            s = float(spot)
+            return lambda: s
+        with self._cache_lock:
+            hit = self._spot_cache.get(ticker.upper())
+        if hit is not None:
+            return lambda: float(hit[0])
+        fut = self._io_pool().submit(self._cached_spot, ticker)
+        return lambda: float(fut.result()[0])
+
+    def _cached(self, cache: TTLCache, key: Hashable, fetch: Callable[[], _T]) -> _T:
+        with self._cache_lock:
+            hit = cache.get(key)
+        if hit is not None:
+            return hit
+        with self._upstream:
+            value = fetch()
+        with self._cache_lock:
+            cache[key] = value
+        return value
+
+    def _cached_spot(self, ticker: str) -> tuple[float, str]:
+        return self._cached(
+            self._spot_cache,
+            ticker.upper(),
+            lambda: self._nasdaq.get_underlying_from_option_chain(ticker),
+        )
+
+    def _cached_chain(self, ticker: str, expiry: date, right: Right) -> tuple[list[dict[str, Any]], str]:
+        def fetch() -> tuple[list[dict[str, Any]], str]:
+            get = (
+                self._nasdaq.get_put_chain_with_underlying
+                if right is Right.PUT
+                else self._nasdaq.get_call_chain_with_underlying
+            )
+            chain, spot, url = get(ticker, expiry)
+            # The chain payload carries the underlying's last trade; prime the spot cache with it
+            # so a following spot lookup doesn't cost another round-trip.
+            if spot is not None:
+                with self._cache_lock:
+                    self._spot_cache.setdefault(ticker.upper(), (spot, url))
+            return chain, url
+
+        return self._cached(self._chain_cache, (ticker.upper(), expiry, right), fetch)
+
+    def _cached_nearest_expiry(self, ticker: str, asof: date) -> tuple[date, str]:
+        def fetch() -> tuple[date, str]:
+            expiry, spot, url = self._nasdaq.pick_nearest_expiry_with_underlying(ticker, asof=asof)
+            # Like the chain payload, the expiry listing carries lastTrade: prime the spot cache.
+            if spot is not None:
+                with self._cache_lock:
+                    self._spot_cache.setdefault(ticker.upper(), (spot, url))
+            return expiry, url
+
+        return self._cached(self._nearest_expiry_cache, (ticker.upper(), asof), fetch)
 
     def get_latest_price(self, ticker: str) -> Dict[str, Any]:
-        price, url = self._nasdaq.get_underlying_from_option_chain(ticker)
+        price, url = self._cached_spot(ticker)
         return {"ticker": ticker.upper(), "price": float(price), "source": url}
 
     def get_option_premium(
@@ -28,36 +306,39 @@ class OptionEngine:
         ticker: str,
         expiry: date,
         strike: float,
-        right: str = "put",
+        right: Right | str = Right.PUT,
         asof: date | None = None,
         spot: float | None = None,
         r: float = 0.0,
         q: float = 0.0,
     ) -> Dict[str, Any]:
-        right = str(right).strip().lower()
-        if right not in {"put", "call"}:
-            raise ValueError("right must be 'put' or 'call'")
+        right = Right.parse(right)
 
         asof_d = asof or date.today()
-        s = float(spot) if spot is not None else self._nasdaq.get_underlying_from_option_chain(ticker)[0]
-        t_years = (expiry - asof_d).days / 365.0
-        inp = BsInputs(s=float(s), k=float(strike), t=float(max(t_years, 0.0)), r=float(r), q=float(q))
+        # The spot and the premium come from independent fetches; overlap them.
+        spot_result = self._spot_async(ticker, spot)
+        with self._upstream:
+            if right is Right.PUT:
+                prem: NasdaqPutPremium | NasdaqCallPremium = self._nasdaq.get_put_premium(ticker, expiry, float(strike))
+            else:
+                prem = self._nasdaq.get_call_premium(ticker, expiry, float(strike))
+        s = spot_result()
+        inp = BsCtx.from_inputs(s, asof_d, expiry, r, q).inputs(float(strike))
 
         def _iv_and_delta(premium_mid: float) -> tuple[float | None, float | None]:
             if premium_mid <= 0:
                 return None, None
-            if right == "put":
-                iv = implied_vol_put_bisect(inp, float(premium_mid)) if inp.t > 0 else None
+            if right is Right.PUT:
+                iv = implied_vol_put_newton(inp, float(premium_mid)) if inp.t > 0 else None
                 delta = bs_put_delta(inp, float(iv)) if iv is not None else (bs_put_delta(inp, 0.0) if inp.t <= 0 else None)
                 return iv, delta
-            iv = implied_vol_call_bisect(inp, float(premium_mid)) if inp.t > 0 else None
+            iv = implied_vol_call_newton(inp, float(premium_mid)) if inp.t > 0 else None
             delta = bs_call_delta(inp, float(iv)) if iv is not None else (bs_call_delta(inp, 0.0) if inp.t <= 0 else None)
             return iv, delta
 
-        if right == "put":
-            p = self._nasdaq.get_put_premium(ticker, expiry, float(strike))
-            d = asdict(p)
-            d["right"] = "put"
+        if right is Right.PUT:
+            d = asdict(prem)
+            d["right"] = right.label
             d["asof"] = asof_d.isoformat()
             d["spot"] = float(s)
             d["r"] = float(r)
@@ -71,9 +352,8 @@ class OptionEngine:
                 d["delta"] = None
             return d
 
-        c = self._nasdaq.get_call_premium(ticker, expiry, float(strike))
-        d = asdict(c)
-        d["right"] = "call"
+        d = asdict(prem)
+        d["right"] = right.label
         d["asof"] = asof_d.isoformat()
         d["spot"] = float(s)
         d["r"] = float(r)
@@ -94,66 +374,53 @@ class OptionEngine:
         expiry: date,
         target_delta: float,
         asof: date,
-        right: str = "put",
+        right: Right | str = Right.PUT,
         spot: float | None = None,
         r: float = 0.0,
         q: float = 0.0,
+        chain: list[dict[str, Any]] | None = None,
+        chain_url: str | None = None,
     ) -> Dict[str, Any]:
-        right = str(right).strip().lower()
-        if right not in {"put", "call"}:
-            raise ValueError("right must be 'put' or 'call'")
+        right = Right.parse(right)
         if expiry <= asof:
             raise ValueError("expiry must be after asof")
 
-        s = float(spot) if spot is not None else self._nasdaq.get_underlying_from_option_chain(ticker)[0]
-        chain, url_chain = (
-            self._nasdaq.get_put_chain(ticker, expiry)
-            if right == "put"
-            else self._nasdaq.get_call_chain(ticker, expiry)
-        )
-
-        t_years = (expiry - asof).days / 365.0
-        base = BsInputs(s=s, k=1.0, t=t_years, r=float(r), q=float(q))
-
-        best: Optional[tuple[float, Dict[str, Any]]] = None
+        # Chain first: fetching it also primes the spot cache.
+        if chain is None:
+            chain, chain_url = self._cached_chain(ticker, expiry, right)
+        url_chain = chain_url
+        s = float(spot) if spot is not None else self._cached_spot(ticker)[0]
 
-        for row in chain:
-            mid = row.get("mid")
-            k = float(row["strike"])
-            if mid is None or mid <= 0:
-                continue
-
-            inp = BsInputs(s=base.s, k=k, t=base.t, r=base.r, q=base.q)
-            iv = implied_vol_put_bisect(inp, float(mid)) if right == "put" else implied_vol_call_bisect(inp, float(mid))
-            if iv is None:
-                continue
-
-            d = bs_put_delta(inp, iv) if right == "put" else bs_call_delta(inp, iv)
-            diff = abs(d - float(target_delta))
-
-            cand = {
-                "ticker": ticker.upper(),
-                "asof": asof.isoformat(),
-                "expiry": expiry.isoformat(),
-                "spot": float(s),
-                "right": right,
-                "target_delta": float(target_delta),
-                "strike": float(k),
-                "delta": float(d),
-                "iv": float(iv),
-                "premium_mid": float(mid),
-                "premium_bid": row.get("bid"),
-                "premium_ask": row.get("ask"),
-                "source": url_chain,
-            }
+        ctx = BsCtx.from_inputs(s, asof, expiry, r, q)
+        rows = [row for row in chain if row.get("mid") is not None and row["mid"] > 0]
+        rows.sort(key=lambda row: float(row["strike"]))
 
-            if best is None or diff < best[0]:
-                best = (diff, cand)
+        args = (rows, ctx, right, float(target_delta))
+        if self._score_workers and len(rows) > _PROCESS_MIN_ROWS and _vector_solver() is None:
+            best = self._score_in_pool(*args)
+        else:
+            best = _score_chain(*args)
 
         if best is None:
             raise RuntimeError("Could not compute delta for any strike (missing mid prices or IV solve failed)")
 
-        return best[1]
+        iv, d = best.iv, best.delta
+        row = rows[best.i]
+        return {
+            "ticker": ticker.upper(),
+            "asof": asof.isoformat(),
+            "expiry": expiry.isoformat(),
+            "spot": float(s),
+            "right": right.label,
+            "target_delta": float(target_delta),
+            "strike": float(row["strike"]),
+            "delta": float(d),
+            "iv": float(iv),
+            "premium_mid": float(row["mid"]),
+            "premium_bid": row.get("bid"),
+            "premium_ask": row.get("ask"),
+            "source": url_chain,
+        }
 
     def strike_and_premium_for_delta(
         self,
@@ -167,14 +434,14 @@ class OptionEngine:
         q: float = 0.0,
     ) -> Dict[str, Any]:
         if expiry is None:
-            expiry, _ = self._nasdaq.pick_nearest_expiry(ticker, asof=asof)
+            expiry, _ = self._cached_nearest_expiry(ticker, asof)
 
         return self.find_strike_for_delta(
             ticker=ticker,
             expiry=expiry,
             target_delta=target_delta,
             asof=asof,
-            right="put",
+            right=Right.PUT,
             spot=spot,
             r=r,
             q=q,
@@ -186,14 +453,14 @@ class OptionEngine:
         ticker: str,
         target_delta: float,
         asof: date,
-        right: str,
+        right: Right | str,
         expiry: date | None = None,
         spot: float | None = None,
         r: float = 0.0,
         q: float = 0.0,
     ) -> Dict[str, Any]:
         if expiry is None:
-            expiry, _ = self._nasdaq.pick_nearest_expiry(ticker, asof=asof)
+            expiry, _ = self._cached_nearest_expiry(ticker, asof)
         return self.find_strike_for_delta(
             ticker=ticker,
             expiry=expiry,
@@ -223,27 +490,42 @@ class OptionEngine:
         if shares % 100 != 0:
             raise ValueError("shares must be a multiple of 100 (1 option contract = 100 shares)")
 
-        s = float(spot) if spot is not None else self._nasdaq.get_underlying_from_option_chain(ticker)[0]
+        chain: list[dict[str, Any]] | None = None
+        chain_url: str | None = None
+        call: NasdaqCallPremium | None = None
+        if strike is None:
+            # One call-chain fetch serves both the spot (via the primed cache) and the strike pick.
+            chain, chain_url = self._cached_chain(ticker, expiry, Right.CALL)
+            s = float(spot) if spot is not None else self._cached_spot(ticker)[0]
+        else:
+            # Explicit strike: the premium and spot fetches are independent; overlap them.
+            spot_result = self._spot_async(ticker, spot)
+            with self._upstream:
+                call = self._nasdaq.get_call_premium(ticker, expiry, float(strike))
+            s = spot_result()
+        ctx = BsCtx.from_inputs(s, asof, expiry, r, q)
+
         if strike is None:
             chosen = self.find_strike_for_delta(
                 ticker=ticker,
                 expiry=expiry,
                 target_delta=float(target_delta),
                 asof=asof,
-                right="call",
+                right=Right.CALL,
                 spot=s,
                 r=r,
                 q=q,
+                chain=chain,
+                chain_url=chain_url,
             )
         else:
-            # User specified a strike; fetch premium and compute IV/delta for that strike.
-            call = self._nasdaq.get_call_premium(ticker, expiry, float(strike))
+            # User specified a strike; compute IV/delta for it from the fetched premium.
+            assert call is not None
             prem = call.mid if call.mid is not None else call.bid
             if prem is None:
                 raise RuntimeError("No usable call premium (mid/bid) returned from Nasdaq")
-            t_years = (expiry - asof).days / 365.0
-            inp = BsInputs(s=float(s), k=float(strike), t=float(t_years), r=float(r), q=float(q))
-            iv = implied_vol_call_bisect(inp, float(prem))
+            inp = ctx.inputs(float(strike))
+            iv = implied_vol_call_newton(inp, float(prem))
             delta = bs_call_delta(inp, float(iv)) if iv is not None else None
 
             chosen = {
@@ -264,7 +546,7 @@ class OptionEngine:
 
         premium = float(chosen["premium_mid"])
         k = float(chosen["strike"])
-        t_years = (expiry - asof).days / 365.0
+        t_years = ctx.t
 
         breakeven = s - premium
         max_profit_per_share = (k - s) + premium
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import requests
+import orjson
+
+if TYPE_CHECKING:
+    import requests
 
 
 @dataclass(frozen=True)
@@ -15,6 +19,51 @@ class FetchResult:
     elapsed_s: float
 
 
+class HttpStatusError(RuntimeError):
+    # Raised for HTTP status >= 400 once retries are exhausted; a RuntimeError so existing
+    # handlers keep working, with the status available to callers that branch on it.
+    def __init__(self, status_code: int, url: str, snippet: str) -> None:
+        super().__init__(f"HTTP {status_code} for {url}: {snippet}")
+        self.status_code = status_code
+
+
+def _snippet(body: bytes) -> str:
+    # Slice before decoding: bot-block pages can be megabytes of HTML.
+    return body[:500].decode("utf-8", errors="replace")
+
+
+# Per-URL lifetimes for the optional on-disk cache. The Yahoo crumb handshake must always be
+# live: a cached crumb page would hand back a token without setting the matching cookies.
+_CACHE_URLS_EXPIRE_AFTER: Dict[str, Any] = {
+    "api.nasdaq.com/api/quote/*/option-chain": 30,
+    "api.nasdaq.com/api/quote/*/info": 30,
+    "query2.finance.yahoo.com/v7/finance/options/*": 15,
+    "query*.finance.yahoo.com/v1/test/getcrumb": 0,
+    "finance.yahoo.com/quote/*": 0,
+}
+
+
+def _make_session() -> requests.Session:
+    # Set STOCK_ANALYSIS_HTTP_CACHE to a sqlite path to cache GETs across runs
+    # (optional: pip install "stock-analysis[cache]"). Stale entries are served if a refetch fails.
+    cache_path = os.environ.get("STOCK_ANALYSIS_HTTP_CACHE")
+    if not cache_path:
+        import requests
+
+        return requests.Session()
+
+    from requests_cache import DO_NOT_CACHE, CachedSession
+
+    return CachedSession(
+        cache_name=cache_path,
+        backend="sqlite",
+        expire_after=30,
+        urls_expire_after={k: v if v else DO_NOT_CACHE for k, v in _CACHE_URLS_EXPIRE_AFTER.items()},
+        allowable_methods=("GET",),
+        stale_if_error=True,
+    )
+
+
 class HttpClient:
     def __init__(
         self,
@@ -26,12 +75,36 @@ class HttpClient:
         ),
         max_retries: int = 3,
         backoff_s: float = 0.6,
+        pool_connections: int = 32,
+        pool_maxsize: int = 64,
     ) -> None:
         self._timeout_s = timeout_s
         self._user_agent = user_agent
-        self._max_retries = max_retries
-        self._backoff_s = backoff_s
-        self._session = requests.Session()
+        # requests/urllib3 are imported here rather than at module import, so importing the
+        # package (CLI --help, the API app) doesn't pay for them until a client is built.
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self._session = _make_session()
+        # Keep-alive pool sized for the API's threadpool so concurrent requests reuse TLS connections.
+        # Retries live in urllib3: connection errors and 429/5xx are retried on the pooled
+        # connection with exponential backoff, honouring Retry-After. Once retries are exhausted
+        # the last response comes back and is reported by the status check below.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_s,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def cookies(self) -> requests.cookies.RequestsCookieJar:
+        return self._session.cookies
 
     def get_json(self, url: str, *, params: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], FetchResult]:
         headers = {
@@ -40,33 +113,21 @@ class HttpClient:
             "Accept-Language": "en-US,en;q=0.9",
         }
 
-        last_err: Optional[Exception] = None
-        for attempt in range(1, self._max_retries + 1):
-            t0 = time.time()
-            try:
-                resp = self._session.get(url, params=params, headers=headers, timeout=self._timeout_s)
-                elapsed = time.time() - t0
-                if resp.status_code >= 400:
-                    # Some providers return HTML on bot blocks; make that visible.
-                    snippet = resp.text[:500]
-                    raise RuntimeError(f"HTTP {resp.status_code} for {resp.url}: {snippet}")
-
-                try:
-                    data = resp.json()
-                except json.JSONDecodeError as e:
-                    snippet = resp.text[:500]
-                    raise RuntimeError(f"Non-JSON response for {resp.url}: {snippet}") from e
-
-                return data, FetchResult(url=resp.url, status_code=resp.status_code, elapsed_s=elapsed)
-            except Exception as e:  # noqa: BLE001
-                last_err = e
-                if attempt < self._max_retries:
-                    time.sleep(self._backoff_s * attempt)
-                    continue
-                raise
-
-        assert last_err is not None
-        raise last_err
+        t0 = time.time()
+        resp = self._session.get(url, params=params, headers=headers, timeout=self._timeout_s)
+        elapsed = time.time() - t0
+        if resp.status_code >= 400:
+            # Some providers return HTML on bot blocks; make that visible.
+            snippet = _snippet(resp.content)
+            raise HttpStatusError(resp.status_code, resp.url, snippet)
+
+        try:
+            data = orjson.loads(resp.content)
+        except orjson.JSONDecodeError as e:
+            snippet = _snippet(resp.content)
+            raise RuntimeError(f"Non-JSON response for {resp.url}: {snippet}") from e
+
+        return data, FetchResult(url=resp.url, status_code=resp.status_code, elapsed_s=elapsed)
 
     def get_text(self, url: str, *, params: Optional[Dict[str, Any]] = None) -> Tuple[str, FetchResult]:
         headers = {
@@ -75,22 +136,25 @@ class HttpClient:
             "Accept-Language": "en-US,en;q=0.9",
         }
 
-        last_err: Optional[Exception] = None
-        for attempt in range(1, self._max_retries + 1):
-            t0 = time.time()
-            try:
-                resp = self._session.get(url, params=params, headers=headers, timeout=self._timeout_s)
-                elapsed = time.time() - t0
-                if resp.status_code >= 400:
-                    snippet = resp.text[:500]
-                    raise RuntimeError(f"HTTP {resp.status_code} for {resp.url}: {snippet}")
-                return resp.text, FetchResult(url=resp.url, status_code=resp.status_code, elapsed_s=elapsed)
-            except Exception as e:  # noqa: BLE001
-                last_err = e
-                if attempt < self._max_retries:
-                    time.sleep(self._backoff_s * attempt)
-                    continue
-                raise
-
-        assert last_err is not None
-        raise last_err
+        t0 = time.time()
+        resp = self._session.get(url, params=params, headers=headers, timeout=self._timeout_s)
+        elapsed = time.time() - t0
+        if resp.status_code >= 400:
+            snippet = _snippet(resp.content)
+            raise HttpStatusError(resp.status_code, resp.url, snippet)
+        return resp.text, FetchResult(url=resp.url, status_code=resp.status_code, elapsed_s=elapsed)
+
+
+_DEFAULT_HTTP: Optional[HttpClient] = None
+_DEFAULT_HTTP_LOCK = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    # Process-wide client shared by every source built without an explicit one, so Nasdaq and
+    # Yahoo fetches reuse one connection pool (DNS, TCP and TLS set up once per host).
+    global _DEFAULT_HTTP
+    if _DEFAULT_HTTP is None:
+        with _DEFAULT_HTTP_LOCK:
+            if _DEFAULT_HTTP is None:
+                _DEFAULT_HTTP = HttpClient()
+    return _DEFAULT_HTTP
@@ -2,15 +2,24 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from datetime import date
 from typing import Optional
 
 
+_SQRT1_2 = 1.0 / math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
 def _norm_cdf(x: float) -> float:
-    # Standard normal CDF via erf
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    # Standard normal CDF via erfc: no cancellation in the lower tail, unlike 0.5 * (1 + erf(x)).
+    return 0.5 * math.erfc(-x * _SQRT1_2)
+
+
+def _norm_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) * _INV_SQRT_2PI
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BsInputs:
     s: float  # spot
     k: float  # strike
@@ -19,64 +28,134 @@ class BsInputs:
     q: float = 0.0  # dividend yield
 
 
-def bs_put_price(inp: BsInputs, sigma: float) -> float:
-    if inp.t <= 0:
-        return max(inp.k - inp.s, 0.0)
+@dataclass(frozen=True, slots=True)
+class BsCtx:
+    # Per-request Black-Scholes context: everything that is invariant across strikes,
+    # computed once. The day-count convention lives in from_inputs.
+    s: float
+    t: float
+    r: float
+    q: float
+    log_f: float  # log of the forward, log(s) + (r - q) * t
+    sqrt_t: float
+    disc_r: float
+    disc_q: float
+    pv_s: float  # s * disc_q
+
+    @classmethod
+    def from_inputs(cls, s: float, asof: date, expiry: date, r: float = 0.0, q: float = 0.0) -> "BsCtx":
+        s, r, q = float(s), float(r), float(q)
+        t = max((expiry - asof).days / 365.0, 0.0)
+        log_s = math.log(s) if s > 0 else float("nan")
+        disc_q = math.exp(-q * t)
+        return cls(
+            s=s,
+            t=t,
+            r=r,
+            q=q,
+            log_f=log_s + (r - q) * t,
+            sqrt_t=math.sqrt(t),
+            disc_r=math.exp(-r * t),
+            disc_q=disc_q,
+            pv_s=s * disc_q,
+        )
+
+    def inputs(self, k: float) -> BsInputs:
+        return BsInputs(s=self.s, k=float(k), t=self.t, r=self.r, q=self.q)
+
+
+def bs_put_price_raw(s: float, k: float, t: float, r: float, q: float, sigma: float) -> float:
+    if t <= 0:
+        return max(k - s, 0.0)
     if sigma <= 0:
         # zero vol => forward intrinsic discounted (approx)
-        f = inp.s * math.exp((inp.r - inp.q) * inp.t)
-        return math.exp(-inp.r * inp.t) * max(inp.k - f, 0.0)
+        f = s * math.exp((r - q) * t)
+        return math.exp(-r * t) * max(k - f, 0.0)
 
-    vsqrt = sigma * math.sqrt(inp.t)
-    d1 = (math.log(inp.s / inp.k) + (inp.r - inp.q + 0.5 * sigma * sigma) * inp.t) / vsqrt
+    vsqrt = sigma * math.sqrt(t)
+    d1 = (math.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vsqrt
     d2 = d1 - vsqrt
 
     nd1 = _norm_cdf(-d1)
     nd2 = _norm_cdf(-d2)
 
-    pv_k = inp.k * math.exp(-inp.r * inp.t)
-    pv_s = inp.s * math.exp(-inp.q * inp.t)
+    pv_k = k * math.exp(-r * t)
+    pv_s = s * math.exp(-q * t)
     return pv_k * nd2 - pv_s * nd1
 
 
-def bs_call_price(inp: BsInputs, sigma: float) -> float:
-    if inp.t <= 0:
-        return max(inp.s - inp.k, 0.0)
+def bs_call_price_raw(s: float, k: float, t: float, r: float, q: float, sigma: float) -> float:
+    if t <= 0:
+        return max(s - k, 0.0)
     if sigma <= 0:
-        f = inp.s * math.exp((inp.r - inp.q) * inp.t)
-        return math.exp(-inp.r * inp.t) * max(f - inp.k, 0.0)
+        f = s * math.exp((r - q) * t)
+        return math.exp(-r * t) * max(f - k, 0.0)
 
-    vsqrt = sigma * math.sqrt(inp.t)
-    d1 = (math.log(inp.s / inp.k) + (inp.r - inp.q + 0.5 * sigma * sigma) * inp.t) / vsqrt
+    vsqrt = sigma * math.sqrt(t)
+    d1 = (math.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vsqrt
     d2 = d1 - vsqrt
 
-    pv_k = inp.k * math.exp(-inp.r * inp.t)
-    pv_s = inp.s * math.exp(-inp.q * inp.t)
+    pv_k = k * math.exp(-r * t)
+    pv_s = s * math.exp(-q * t)
     return pv_s * _norm_cdf(d1) - pv_k * _norm_cdf(d2)
 
 
-def bs_put_delta(inp: BsInputs, sigma: float) -> float:
-    if inp.t <= 0:
-        return -1.0 if inp.s < inp.k else 0.0
+def bs_put_price(inp: BsInputs, sigma: float) -> float:
+    return bs_put_price_raw(inp.s, inp.k, inp.t, inp.r, inp.q, sigma)
+
+
+def bs_call_price(inp: BsInputs, sigma: float) -> float:
+    return bs_call_price_raw(inp.s, inp.k, inp.t, inp.r, inp.q, sigma)
+
+
+def bs_put_delta_raw(s: float, k: float, t: float, r: float, q: float, sigma: float) -> float:
+    if t <= 0:
+        return -1.0 if s < k else 0.0
     if sigma <= 0:
-        f = inp.s * math.exp((inp.r - inp.q) * inp.t)
-        return -math.exp(-inp.q * inp.t) if f < inp.k else 0.0
+        f = s * math.exp((r - q) * t)
+        return -math.exp(-q * t) if f < k else 0.0
 
-    vsqrt = sigma * math.sqrt(inp.t)
-    d1 = (math.log(inp.s / inp.k) + (inp.r - inp.q + 0.5 * sigma * sigma) * inp.t) / vsqrt
-    return -math.exp(-inp.q * inp.t) * _norm_cdf(-d1)
+    vsqrt = sigma * math.sqrt(t)
+    d1 = (math.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vsqrt
+    return -math.exp(-q * t) * _norm_cdf(-d1)
 
 
-def bs_call_delta(inp: BsInputs, sigma: float) -> float:
-    if inp.t <= 0:
-        return 1.0 if inp.s > inp.k else 0.0
+def bs_call_delta_raw(s: float, k: float, t: float, r: float, q: float, sigma: float) -> float:
+    if t <= 0:
+        return 1.0 if s > k else 0.0
     if sigma <= 0:
-        f = inp.s * math.exp((inp.r - inp.q) * inp.t)
-        return math.exp(-inp.q * inp.t) if f > inp.k else 0.0
+        f = s * math.exp((r - q) * t)
+        return math.exp(-q * t) if f > k else 0.0
+
+    vsqrt = sigma * math.sqrt(t)
+    d1 = (math.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vsqrt
+    return math.exp(-q * t) * _norm_cdf(d1)
+
+
+def bs_put_delta(inp: BsInputs, sigma: float) -> float:
+    return bs_put_delta_raw(inp.s, inp.k, inp.t, inp.r, inp.q, sigma)
+
+
+def bs_call_delta(inp: BsInputs, sigma: float) -> float:
+    return bs_call_delta_raw(inp.s, inp.k, inp.t, inp.r, inp.q, sigma)
+
+
+def bs_put_vega_raw(s: float, k: float, t: float, r: float, q: float, sigma: float) -> float:
+    if t <= 0 or sigma <= 0:
+        return 0.0
+
+    vsqrt = sigma * math.sqrt(t)
+    d1 = (math.log(s / k) + (r - q + 0.5 * sigma * sigma) * t) / vsqrt
+    return s * math.exp(-q * t) * math.sqrt(t) * _norm_pdf(d1)
 
-    vsqrt = sigma * math.sqrt(inp.t)
-    d1 = (math.log(inp.s / inp.k) + (inp.r - inp.q + 0.5 * sigma * sigma) * inp.t) / vsqrt
-    return math.exp(-inp.q * inp.t) * _norm_cdf(d1)
+
+def bs_put_vega(inp: BsInputs, sigma: float) -> float:
+    return bs_put_vega_raw(inp.s, inp.k, inp.t, inp.r, inp.q, sigma)
+
+
+def bs_call_vega(inp: BsInputs, sigma: float) -> float:
+    # Put-call parity: vega is the same for both rights.
+    return bs_put_vega(inp, sigma)
 
 
 def implied_vol_put_bisect(
@@ -124,6 +203,62 @@ def implied_vol_put_bisect(
     return 0.5 * (a + b)
 
 
+def implied_vol_put_raw(
+    s: float,
+    k: float,
+    t: float,
+    r: float,
+    q: float,
+    target_price: float,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+) -> Optional[float]:
+    if target_price <= 0 or s <= 0 or k <= 0 or t <= 0:
+        return None
+    log_fk = math.log(s / k) + (r - q) * t
+    pv_s, pv_k = s * math.exp(-q * t), k * math.exp(-r * t)
+    return _implied_vol_newton_fast(log_fk, math.sqrt(t), pv_s, pv_k, target_price, True, tol=tol, max_iter=max_iter)
+
+
+def implied_vol_call_raw(
+    s: float,
+    k: float,
+    t: float,
+    r: float,
+    q: float,
+    target_price: float,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+) -> Optional[float]:
+    if target_price <= 0 or s <= 0 or k <= 0 or t <= 0:
+        return None
+    log_fk = math.log(s / k) + (r - q) * t
+    pv_s, pv_k = s * math.exp(-q * t), k * math.exp(-r * t)
+    return _implied_vol_newton_fast(log_fk, math.sqrt(t), pv_s, pv_k, target_price, False, tol=tol, max_iter=max_iter)
+
+
+def implied_vol_put_newton(
+    inp: BsInputs,
+    target_price: float,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+) -> Optional[float]:
+    return implied_vol_put_raw(inp.s, inp.k, inp.t, inp.r, inp.q, target_price, tol=tol, max_iter=max_iter)
+
+
+def implied_vol_call_newton(
+    inp: BsInputs,
+    target_price: float,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+) -> Optional[float]:
+    return implied_vol_call_raw(inp.s, inp.k, inp.t, inp.r, inp.q, target_price, tol=tol, max_iter=max_iter)
+
+
 def implied_vol_call_bisect(
     inp: BsInputs,
     target_price: float,
@@ -166,3 +301,153 @@ def implied_vol_call_bisect(
             a, fa = m, fm
 
     return 0.5 * (a + b)
+
+
+# Chain-scan helpers: callers precompute the strike-invariant terms once per (s, t, r, q)
+# and the per-strike log forward moneyness, so the bisection loop does no log/exp/sqrt of its own.
+# log_fk = log(s / k) + (r - q) * t, pv_s = s * exp(-q * t), pv_k = k * exp(-r * t).
+
+
+def _d1_fast(log_fk: float, sqrt_t: float, sigma: float) -> float:
+    vsqrt = sigma * sqrt_t
+    return log_fk / vsqrt + 0.5 * vsqrt
+
+
+def _bs_price_fast(log_fk: float, sqrt_t: float, pv_s: float, pv_k: float, sigma: float, is_put: bool) -> float:
+    vsqrt = sigma * sqrt_t
+    d1 = log_fk / vsqrt + 0.5 * vsqrt
+    d2 = d1 - vsqrt
+    if is_put:
+        return pv_k * _norm_cdf(-d2) - pv_s * _norm_cdf(-d1)
+    return pv_s * _norm_cdf(d1) - pv_k * _norm_cdf(d2)
+
+
+def _bs_put_delta_fast(log_fk: float, sqrt_t: float, disc_q: float, sigma: float) -> float:
+    return -disc_q * _norm_cdf(-_d1_fast(log_fk, sqrt_t, sigma))
+
+
+def _bs_call_delta_fast(log_fk: float, sqrt_t: float, disc_q: float, sigma: float) -> float:
+    return disc_q * _norm_cdf(_d1_fast(log_fk, sqrt_t, sigma))
+
+
+def _implied_vol_bisect_fast(
+    log_fk: float,
+    sqrt_t: float,
+    pv_s: float,
+    pv_k: float,
+    target_price: float,
+    is_put: bool,
+    *,
+    lo: float = 1e-6,
+    hi: float = 5.0,
+    max_iter: int = 80,
+    tol: float = 1e-6,
+) -> Optional[float]:
+    # Same bounds checks and stopping rule as implied_vol_put_bisect / implied_vol_call_bisect.
+    if target_price <= 0 or pv_k <= 0:
+        return None
+
+    if is_put:
+        lower, upper = max(pv_k - pv_s, 0.0), pv_k
+    else:
+        lower, upper = max(pv_s - pv_k, 0.0), pv_s
+    if not (lower - 1e-9 <= target_price <= upper + 1e-9):
+        return None
+
+    f_lo = _bs_price_fast(log_fk, sqrt_t, pv_s, pv_k, lo, is_put) - target_price
+    f_hi = _bs_price_fast(log_fk, sqrt_t, pv_s, pv_k, hi, is_put) - target_price
+
+    if f_lo == 0:
+        return lo
+    if f_hi == 0:
+        return hi
+
+    if f_lo * f_hi > 0:
+        return None
+
+    a, b = lo, hi
+    fa = f_lo
+    for _ in range(max_iter):
+        m = 0.5 * (a + b)
+        fm = _bs_price_fast(log_fk, sqrt_t, pv_s, pv_k, m, is_put) - target_price
+        if abs(fm) < tol or (b - a) < 1e-6:
+            return m
+        if fa * fm <= 0:
+            b = m
+        else:
+            a, fa = m, fm
+
+    return 0.5 * (a + b)
+
+
+def _implied_vol_newton_fast(
+    log_fk: float,
+    sqrt_t: float,
+    pv_s: float,
+    pv_k: float,
+    target_price: float,
+    is_put: bool,
+    *,
+    tol: float = 1e-6,
+    max_iter: int = 20,
+    lo: float = 1e-6,
+    hi: float = 5.0,
+    init: Optional[float] = None,
+) -> Optional[float]:
+    # Safeguarded Newton on price with analytic vega: converges in a handful of steps from a
+    # decent seed, and any step that leaves the current bracket (or a vanishing vega, deep
+    # ITM/OTM) is replaced by one bisection step. Accepts/rejects exactly the same inputs as
+    # _implied_vol_bisect_fast.
+    if target_price <= 0 or pv_k <= 0:
+        return None
+
+    if is_put:
+        lower, upper = max(pv_k - pv_s, 0.0), pv_k
+    else:
+        lower, upper = max(pv_s - pv_k, 0.0), pv_s
+    if not (lower - 1e-9 <= target_price <= upper + 1e-9):
+        return None
+
+    f_lo = _bs_price_fast(log_fk, sqrt_t, pv_s, pv_k, lo, is_put) - target_price
+    f_hi = _bs_price_fast(log_fk, sqrt_t, pv_s, pv_k, hi, is_put) - target_price
+    if f_lo == 0:
+        return lo
+    if f_hi == 0:
+        return hi
+    if f_lo * f_hi > 0:
+        return None
+
+    if init is not None and lo < init < hi:
+        # Warm start, e.g. the neighbouring strike's solution during a chain scan.
+        sigma = init
+    else:
+        # Brenner-Subrahmanyam ATM seed on the time value.
+        sigma = math.sqrt(2.0 * math.pi) * max(target_price - lower, 0.0) / (pv_s * sqrt_t)
+        sigma = min(max(sigma, 0.05), hi)
+    # Price is increasing in sigma, so the sign of each residual tightens the bracket [a, b].
+    a, b = lo, hi
+    for _ in range(max_iter):
+        vsqrt = sigma * sqrt_t
+        d1 = log_fk / vsqrt + 0.5 * vsqrt
+        d2 = d1 - vsqrt
+        if is_put:
+            price = pv_k * _norm_cdf(-d2) - pv_s * _norm_cdf(-d1)
+        else:
+            price = pv_s * _norm_cdf(d1) - pv_k * _norm_cdf(d2)
+        diff = price - target_price
+        if abs(diff) < tol:
+            return sigma
+        if diff > 0:
+            b = sigma
+        else:
+            a = sigma
+        if (b - a) < 1e-6:
+            return 0.5 * (a + b)
+
+        vega = pv_s * _norm_pdf(d1) * sqrt_t
+        nxt = sigma - diff / vega if vega > 1e-12 else a
+        # Newton step unless it leaves the bracket; then a single bisection step.
+        sigma = nxt if a < nxt < b else 0.5 * (a + b)
+
+    return _implied_vol_bisect_fast(log_fk, sqrt_t, pv_s, pv_k, target_price, is_put, lo=a, hi=b, tol=tol)
+
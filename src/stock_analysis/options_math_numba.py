@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+
+import numpy as np
+from numba import config, njit, prange, threading_layer
+
+# API handlers run kernels from worker threads, and a TBB pool first entered off the main thread
+# keeps the interpreter from exiting. Prefer OpenMP; NUMBA_THREADING_LAYER(_PRIORITY) still wins.
+if "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+    config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+# fastmath minus nnan/ninf: failed solves are reported as NaN and must survive the kernel.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+_SQRT1_2 = 1.0 / math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+_INV_SQRT_2PI = 1.0 / _SQRT_2PI
+
+_IV_LO = 1e-6
+_IV_HI = 5.0
+_N_ITER = 20
+_TOL = 1e-6
+# Below this many strikes the thread fan-out costs more than it saves.
+_PARALLEL_MIN = 32
+
+# The workqueue layer (the fallback when neither OpenMP nor TBB is installed) aborts the process
+# on concurrent parallel launches. Parallel launches are serialized until the first one reveals
+# the layer, and for good if it turns out to be workqueue.
+_PAR_LOCK = threading.Lock()
+_par_serialized = True
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _norm_cdf(x: float) -> float:
+    # erfc keeps full relative precision in the lower tail, unlike 0.5 * (1 + erf(x)).
+    return 0.5 * math.erfc(-x * _SQRT1_2)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _norm_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) * _INV_SQRT_2PI
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _d1(s: float, k: float, t: float, r: float, q: float, sig: float) -> float:
+    return (math.log(s / k) + (r - q + 0.5 * sig * sig) * t) / (sig * math.sqrt(t))
+
+
+# Scalar counterparts of the options_math functions, taking the BsInputs fields positionally.
+# They assume t > 0 and sigma > 0; the IV solvers check their inputs and return NaN on failure.
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def bs_put_price_nb(s: float, k: float, t: float, r: float, q: float, sig: float) -> float:
+    d1 = _d1(s, k, t, r, q, sig)
+    d2 = d1 - sig * math.sqrt(t)
+    return k * math.exp(-r * t) * _norm_cdf(-d2) - s * math.exp(-q * t) * _norm_cdf(-d1)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def bs_call_price_nb(s: float, k: float, t: float, r: float, q: float, sig: float) -> float:
+    d1 = _d1(s, k, t, r, q, sig)
+    d2 = d1 - sig * math.sqrt(t)
+    return s * math.exp(-q * t) * _norm_cdf(d1) - k * math.exp(-r * t) * _norm_cdf(d2)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def bs_put_delta_nb(s: float, k: float, t: float, r: float, q: float, sig: float) -> float:
+    return -math.exp(-q * t) * _norm_cdf(-_d1(s, k, t, r, q, sig))
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def bs_call_delta_nb(s: float, k: float, t: float, r: float, q: float, sig: float) -> float:
+    return math.exp(-q * t) * _norm_cdf(_d1(s, k, t, r, q, sig))
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _implied_vol_nb(
+    s: float, k: float, t: float, r: float, q: float, target: float, is_put: bool, lo: float, hi: float
+) -> float:
+    # Mirrors options_math._implied_vol_newton_fast: same input checks, same seed, Newton steps
+    # kept inside a shrinking bracket, with a bisection step whenever Newton would leave it.
+    if target <= 0.0 or s <= 0.0 or k <= 0.0 or t <= 0.0:
+        return np.nan
+
+    sqrt_t = math.sqrt(t)
+    log_fk = math.log(s / k) + (r - q) * t
+    pv_s = s * math.exp(-q * t)
+    pv_k = k * math.exp(-r * t)
+    if is_put:
+        lower = max(pv_k - pv_s, 0.0)
+        upper = pv_k
+    else:
+        lower = max(pv_s - pv_k, 0.0)
+        upper = pv_s
+    if target < lower - 1e-9 or target > upper + 1e-9:
+        return np.nan
+
+    if is_put:
+        f_lo = bs_put_price_nb(s, k, t, r, q, lo) - target
+        f_hi = bs_put_price_nb(s, k, t, r, q, hi) - target
+    else:
+        f_lo = bs_call_price_nb(s, k, t, r, q, lo) - target
+        f_hi = bs_call_price_nb(s, k, t, r, q, hi) - target
+    if f_lo == 0.0:
+        return lo
+    if f_hi == 0.0:
+        return hi
+    if f_lo * f_hi > 0.0:
+        return np.nan
+
+    sig = _SQRT_2PI * max(target - lower, 0.0) / (pv_s * sqrt_t)
+    sig = min(max(sig, 0.05), hi)
+    a = lo
+    b = hi
+    for _ in range(_N_ITER):
+        vsqrt = sig * sqrt_t
+        d1 = log_fk / vsqrt + 0.5 * vsqrt
+        d2 = d1 - vsqrt
+        if is_put:
+            price = pv_k * _norm_cdf(-d2) - pv_s * _norm_cdf(-d1)
+        else:
+            price = pv_s * _norm_cdf(d1) - pv_k * _norm_cdf(d2)
+        diff = price - target
+        if abs(diff) < _TOL:
+            return sig
+        if diff > 0.0:
+            b = sig
+        else:
+            a = sig
+        if b - a < 1e-6:
+            return 0.5 * (a + b)
+
+        vega = pv_s * sqrt_t * _norm_pdf(d1)
+        nxt = sig - diff / vega if vega > 1e-12 else a
+        sig = nxt if a < nxt < b else 0.5 * (a + b)
+    return 0.5 * (a + b)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def implied_vol_put_nb(
+    s: float, k: float, t: float, r: float, q: float, target: float, lo: float = _IV_LO, hi: float = _IV_HI
+) -> float:
+    return _implied_vol_nb(s, k, t, r, q, target, True, lo, hi)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def implied_vol_call_nb(
+    s: float, k: float, t: float, r: float, q: float, target: float, lo: float = _IV_LO, hi: float = _IV_HI
+) -> float:
+    return _implied_vol_nb(s, k, t, r, q, target, False, lo, hi)
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _solve_strike(s: float, k: float, t: float, r: float, q: float, mid: float, is_put: bool):
+    sig = implied_vol_put_nb(s, k, t, r, q, mid) if is_put else implied_vol_call_nb(s, k, t, r, q, mid)
+    if np.isnan(sig):
+        return sig, np.nan
+    d = bs_put_delta_nb(s, k, t, r, q, sig) if is_put else bs_call_delta_nb(s, k, t, r, q, sig)
+    return sig, d
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _closest(out_delta, target: float) -> int:
+    # Index whose delta is closest to target, -1 if no strike solved.
+    i_best = -1
+    best = np.inf
+    for i in range(out_delta.shape[0]):
+        d = out_delta[i]
+        if np.isnan(d):
+            continue
+        diff = abs(d - target)
+        if diff < best:
+            best = diff
+            i_best = i
+    return i_best
+
+
+# Serial and parallel kernels are separate functions so each gets its own on-disk cache entry;
+# compiling one Python function twice with cache=True makes the builds overwrite each other.
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _solve_iv_vec(s, k, t, r, q, mid, is_put, target, out_iv, out_delta):
+    for i in range(k.shape[0]):
+        out_iv[i], out_delta[i] = _solve_strike(s, k[i], t, r, q, mid[i], is_put)
+    return _closest(out_delta, target)
+
+
+@njit(parallel=True, cache=True, fastmath=_FASTMATH)
+def _solve_iv_vec_par(s, k, t, r, q, mid, is_put, target, out_iv, out_delta):
+    # Strikes are independent, so the solve fans out across threads.
+    for i in prange(k.shape[0]):
+        out_iv[i], out_delta[i] = _solve_strike(s, k[i], t, r, q, mid[i], is_put)
+    return _closest(out_delta, target)
+
+
+def _run_parallel(*args):
+    global _par_serialized
+    if not _par_serialized:
+        return _solve_iv_vec_par(*args)
+    with _PAR_LOCK:
+        i_best = _solve_iv_vec_par(*args)
+        _par_serialized = threading_layer() == "workqueue"
+    return i_best
+
+
+def solve_chain(
+    s: float,
+    k: np.ndarray,
+    t: float,
+    r: float,
+    q: float,
+    mid: np.ndarray,
+    target: float,
+    *,
+    is_put: bool,
+) -> tuple[int, np.ndarray, np.ndarray]:
+    # Drop-in for options_math_numpy.solve_chain: (i_best, iv, delta), NaN where IV did not solve.
+    k = np.ascontiguousarray(k, dtype=np.float64)
+    mid = np.ascontiguousarray(mid, dtype=np.float64)
+    out_iv = np.empty_like(k)
+    out_delta = np.empty_like(k)
+    kernel = _run_parallel if k.shape[0] > _PARALLEL_MIN else _solve_iv_vec
+    i_best = kernel(
+        float(s), k, float(t), float(r), float(q), mid, bool(is_put), float(target), out_iv, out_delta
+    )
+    return int(i_best), out_iv, out_delta
+
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from scipy.special import ndtr
+
+
+def solve_iv_delta(
+    s: float,
+    k: np.ndarray,
+    t: float,
+    r: float,
+    q: float,
+    mid: np.ndarray,
+    *,
+    is_put: bool,
+    lo: float = 1e-6,
+    hi: float = 5.0,
+    n_iter: int = 20,
+    tol: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Vectorized counterpart of implied_vol_*_newton + bs_*_delta over a whole strike vector.
+    # All strikes advance through a safeguarded Newton iteration together: each strike keeps its
+    # own bracket [a, b] and takes a bisection step wherever the Newton step would leave it.
+    # Entries whose IV cannot be solved (outside no-arb bounds or not bracketed by [lo, hi])
+    # come back as NaN.
+    k = np.asarray(k, dtype=np.float64)
+    mid = np.asarray(mid, dtype=np.float64)
+    if s <= 0 or t <= 0:
+        # Same as the scalar and numba solvers: nothing solves, rather than a math domain error.
+        nan = np.full_like(k, np.nan)
+        return nan, nan.copy()
+
+    # Non-positive strikes are masked out below (like non-positive mids); give them a harmless
+    # placeholder so the log and the bounds stay finite.
+    k_pos = k > 0
+    k_safe = np.where(k_pos, k, 1.0)
+    log_fk = math.log(s) - np.log(k_safe) + (r - q) * t
+    sqrt_t = math.sqrt(t)
+    disc_q = math.exp(-q * t)
+    pv_s = s * disc_q
+    pv_k = k_safe * math.exp(-r * t)
+
+    def _price_d1(sig: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        vsqrt = sig * sqrt_t
+        d1 = log_fk / vsqrt + 0.5 * vsqrt
+        d2 = d1 - vsqrt
+        if is_put:
+            return pv_k * ndtr(-d2) - pv_s * ndtr(-d1), d1
+        return pv_s * ndtr(d1) - pv_k * ndtr(d2), d1
+
+    # Basic no-arb bounds, as in the scalar solvers.
+    if is_put:
+        lower = np.maximum(pv_k - pv_s, 0.0)
+        upper = pv_k
+    else:
+        lower = np.maximum(pv_s - pv_k, 0.0)
+        upper = np.full_like(k, pv_s)
+    ok = (mid > 0) & k_pos & (lower - 1e-9 <= mid) & (mid <= upper + 1e-9)
+
+    a = np.full_like(k, lo)
+    b = np.full_like(k, hi)
+    f_lo = _price_d1(a)[0] - mid
+    f_hi = _price_d1(b)[0] - mid
+    ok &= f_lo * f_hi <= 0
+
+    # Brenner-Subrahmanyam seed on the time value, as in the scalar solver.
+    sig = np.sqrt(2.0 * np.pi) * np.maximum(mid - lower, 0.0) / (pv_s * sqrt_t)
+    sig = np.clip(np.nan_to_num(sig, nan=0.05), 0.05, hi)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(n_iter):
+            price, d1 = _price_d1(sig)
+            diff = price - mid
+            if not np.any(ok & (np.abs(diff) >= tol) & (b - a >= 1e-6)):
+                break
+            above = diff > 0
+            b = np.where(above, sig, b)
+            a = np.where(above, a, sig)
+
+            vega = pv_s * sqrt_t * np.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+            nxt = sig - diff / vega
+            step = (vega > 1e-12) & (a < nxt) & (nxt < b)
+            done = np.abs(diff) < tol
+            sig = np.where(done, sig, np.where(step, nxt, 0.5 * (a + b)))
+
+    _, d1 = _price_d1(sig)
+    delta = -disc_q * ndtr(-d1) if is_put else disc_q * ndtr(d1)
+
+    iv = sig
+    iv[~ok] = np.nan
+    delta[~ok] = np.nan
+    return iv, delta
+
+
+def solve_chain(
+    s: float,
+    k: np.ndarray,
+    t: float,
+    r: float,
+    q: float,
+    mid: np.ndarray,
+    target: float,
+    *,
+    is_put: bool,
+) -> tuple[int, np.ndarray, np.ndarray]:
+    # (i_best, iv, delta): i_best is the strike whose delta is closest to target, -1 if none solved.
+    iv, delta = solve_iv_delta(s, k, t, r, q, mid, is_put=is_put)
+    diff = np.abs(delta - target)
+    if not np.any(~np.isnan(diff)):
+        return -1, iv, delta
+    return int(np.nanargmin(diff)), iv, delta
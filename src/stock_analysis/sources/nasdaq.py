@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
 import re
 
-from ..http import HttpClient
+from ..http import HttpClient, HttpStatusError, default_client
 
 
 NASDAQ_OPTION_CHAIN_URL = "https://api.nasdaq.com/api/quote/{ticker}/option-chain"
@@ -39,13 +41,16 @@ class NasdaqCallPremium:
     urls: List[str]
 
 
+_MISSING = frozenset({"", "--", "N/A"})
+
+
 def _to_float(v: Any) -> Optional[float]:
     if v is None:
         return None
     if isinstance(v, (int, float)):
         return float(v)
     s = str(v).strip()
-    if not s or s in {"--", "N/A"}:
+    if s in _MISSING:
         return None
     # Nasdaq returns plain numbers as strings.
     try:
@@ -54,9 +59,27 @@ def _to_float(v: Any) -> Optional[float]:
         return None
 
 
+_PRICE_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+_MONTH_DAY_YEAR_FMT = "%B %d, %Y"
+
+
+def _parse_price(s: str) -> float:
+    # "$1,234.56" -> 1234.56; raises ValueError on anything else.
+    return float(s.strip().lstrip("$").replace(",", ""))
+
+
+# Expiry-group headers ("February 13, 2026") repeat across every chain fetch; parse each once.
+@lru_cache(maxsize=1024)
+def _parse_nasdaq_date(s: str) -> Optional[date]:
+    try:
+        return datetime.strptime(s, _MONTH_DAY_YEAR_FMT).date()
+    except ValueError:
+        return None
+
+
 class Nasdaq:
     def __init__(self, http: Optional[HttpClient] = None) -> None:
-        self._http = http or HttpClient()
+        self._http = http or default_client()
 
     def _fetch_option_chain(
         self,
@@ -77,14 +100,31 @@ class Nasdaq:
             raise RuntimeError(f"Unexpected Nasdaq payload for {ticker}: {data.get('message') or data}")
         return data, meta.url
 
-    def get_underlying_from_option_chain(self, ticker: str) -> tuple[float, str]:
-        data, url = self._fetch_option_chain(ticker)
+    @staticmethod
+    def _parse_last_trade(data: dict) -> Optional[float]:
         last_trade = (data.get("data") or {}).get("lastTrade") or ""
         # Example: "LAST TRADE: $82.2 (AS OF FEB 6, 2026)"
-        m = re.search(r"\$\s*(\d+(?:\.\d+)?)", str(last_trade))
-        if not m:
+        m = _PRICE_RE.search(str(last_trade))
+        return _parse_price(m.group(1)) if m else None
+
+    def get_underlying_from_option_chain(self, ticker: str) -> tuple[float, str]:
+        # The /info quote is a ~2 KB payload versus the full multi-expiry chain; the chain's
+        # lastTrade string is only the fallback when /info has no usable price (4xx, missing or
+        # unparseable field). A 429/5xx means Nasdaq is throttling or down: don't double the load.
+        try:
+            return self.get_last_trade_price(ticker)
+        except HttpStatusError as e:
+            if e.status_code == 429 or e.status_code >= 500:
+                raise
+        except (RuntimeError, ValueError):
+            pass
+
+        data, url = self._fetch_option_chain(ticker)
+        price = self._parse_last_trade(data)
+        if price is None:
+            last_trade = (data.get("data") or {}).get("lastTrade")
             raise RuntimeError(f"Could not parse underlying lastTrade for {ticker}: {last_trade!r}")
-        return float(m.group(1)), url
+        return price, url
 
     def get_put_premium(self, ticker: str, expiry: date, strike: float) -> NasdaqPutPremium:
         # Nasdaq's option-chain endpoint defaults to a limited expiry window.
@@ -101,10 +141,7 @@ class Nasdaq:
             group = r.get("expirygroup")
             if group:
                 # Example: "February 13, 2026"
-                try:
-                    current_group = datetime.strptime(group.strip(), "%B %d, %Y").date()
-                except ValueError:
-                    current_group = None
+                current_group = _parse_nasdaq_date(group.strip())
                 continue
 
             if current_group != expiry:
@@ -163,10 +200,7 @@ class Nasdaq:
         for r in rows:
             group = r.get("expirygroup")
             if group:
-                try:
-                    current_group = datetime.strptime(group.strip(), "%B %d, %Y").date()
-                except ValueError:
-                    current_group = None
+                current_group = _parse_nasdaq_date(group.strip())
                 continue
 
             if current_group != expiry:
@@ -210,131 +244,99 @@ class Nasdaq:
             urls=[url_used],
         )
 
-    def get_put_chain(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], str]:
-        # Nasdaq's option-chain endpoint defaults to a limited expiry window.
-        # Request the specific expiry to ensure the desired chain is returned.
-        data, url_used = self._fetch_option_chain(ticker, fromdate=expiry, todate=expiry)
+    def _chain_rows(self, ticker: str, expiry: date, data: dict, prefix: str) -> list[dict[str, Any]]:
         rows: List[Dict[str, Any]] = data["data"]["table"].get("rows") or []
         if not rows:
             raise RuntimeError(f"No option-chain rows returned for {ticker} from Nasdaq")
 
-        current_group: Optional[date] = None
-        puts: list[dict[str, Any]] = []
-        for r in rows:
-            group = r.get("expirygroup")
-            if group:
-                try:
-                    current_group = datetime.strptime(group.strip(), "%B %d, %Y").date()
-                except ValueError:
-                    current_group = None
+        bid_key, ask_key, last_key = f"{prefix}_Bid", f"{prefix}_Ask", f"{prefix}_Last"
+        to_float = _to_float
+        out: list[dict[str, Any]] = []
+        n = len(rows)
+        i = 0
+        while i < n:
+            group = rows[i].get("expirygroup")
+            i += 1
+            if not group or _parse_nasdaq_date(group.strip()) != expiry:
                 continue
 
-            if current_group != expiry:
-                continue
-
-            strike_f = _to_float(r.get("strike"))
-            if strike_f is None:
-                continue
-
-            bid = _to_float(r.get("p_Bid"))
-            ask = _to_float(r.get("p_Ask"))
-            last = _to_float(r.get("p_Last"))
-            mid: Optional[float] = None
-            if bid is not None and ask is not None:
-                mid = (bid + ask) / 2.0
-            elif last is not None:
-                mid = last
-
-            puts.append(
-                {
-                    "strike": strike_f,
-                    "bid": bid,
-                    "ask": ask,
-                    "last": last,
-                    "mid": mid,
-                }
-            )
-
-        if not puts:
-            raise RuntimeError(f"No puts found for {ticker} expiry={expiry} via Nasdaq")
-
-        puts.sort(key=lambda x: float(x["strike"]))
-        return puts, url_used
-
-    def get_call_chain(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], str]:
+            # Inside the requested group: consume rows until the next group header.
+            while i < n:
+                r = rows[i]
+                if r.get("expirygroup"):
+                    break
+                i += 1
+                strike_f = to_float(r.get("strike"))
+                if strike_f is None:
+                    continue
+
+                bid = to_float(r.get(bid_key))
+                ask = to_float(r.get(ask_key))
+                last = to_float(r.get(last_key))
+                if bid is not None and ask is not None:
+                    mid: Optional[float] = (bid + ask) / 2.0
+                else:
+                    mid = last
+
+                out.append({"strike": strike_f, "bid": bid, "ask": ask, "last": last, "mid": mid})
+
+        out.sort(key=itemgetter("strike"))
+        return out
+
+    def get_put_chain_with_underlying(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], Optional[float], str]:
+        # The expiry-scoped payload also carries lastTrade, so spot comes for free with the chain.
         # Nasdaq's option-chain endpoint defaults to a limited expiry window.
         # Request the specific expiry to ensure the desired chain is returned.
         data, url_used = self._fetch_option_chain(ticker, fromdate=expiry, todate=expiry)
-        rows: List[Dict[str, Any]] = data["data"]["table"].get("rows") or []
-        if not rows:
-            raise RuntimeError(f"No option-chain rows returned for {ticker} from Nasdaq")
-
-        current_group: Optional[date] = None
-        calls: list[dict[str, Any]] = []
-        for r in rows:
-            group = r.get("expirygroup")
-            if group:
-                try:
-                    current_group = datetime.strptime(group.strip(), "%B %d, %Y").date()
-                except ValueError:
-                    current_group = None
-                continue
-
-            if current_group != expiry:
-                continue
-
-            strike_f = _to_float(r.get("strike"))
-            if strike_f is None:
-                continue
-
-            bid = _to_float(r.get("c_Bid"))
-            ask = _to_float(r.get("c_Ask"))
-            last = _to_float(r.get("c_Last"))
-            mid: Optional[float] = None
-            if bid is not None and ask is not None:
-                mid = (bid + ask) / 2.0
-            elif last is not None:
-                mid = last
-
-            calls.append(
-                {
-                    "strike": strike_f,
-                    "bid": bid,
-                    "ask": ask,
-                    "last": last,
-                    "mid": mid,
-                }
-            )
+        puts = self._chain_rows(ticker, expiry, data, "p")
+        if not puts:
+            raise RuntimeError(f"No puts found for {ticker} expiry={expiry} via Nasdaq")
+        return puts, self._parse_last_trade(data), url_used
 
+    def get_call_chain_with_underlying(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], Optional[float], str]:
+        data, url_used = self._fetch_option_chain(ticker, fromdate=expiry, todate=expiry)
+        calls = self._chain_rows(ticker, expiry, data, "c")
         if not calls:
             raise RuntimeError(f"No calls found for {ticker} expiry={expiry} via Nasdaq")
+        return calls, self._parse_last_trade(data), url_used
 
-        calls.sort(key=lambda x: float(x["strike"]))
+    def get_put_chain(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], str]:
+        puts, _, url_used = self.get_put_chain_with_underlying(ticker, expiry)
+        return puts, url_used
+
+    def get_call_chain(self, ticker: str, expiry: date) -> tuple[list[dict[str, Any]], str]:
+        calls, _, url_used = self.get_call_chain_with_underlying(ticker, expiry)
         return calls, url_used
 
-    def get_available_expiries(self, ticker: str) -> tuple[list[date], str]:
-        data, url_used = self._fetch_option_chain(ticker)
+    def _expiry_groups(self, ticker: str, data: dict) -> list[date]:
         rows: List[Dict[str, Any]] = data["data"]["table"].get("rows") or []
         expiries: list[date] = []
         for r in rows:
             group = r.get("expirygroup")
             if not group:
                 continue
-            try:
-                expiries.append(datetime.strptime(group.strip(), "%B %d, %Y").date())
-            except ValueError:
-                continue
+            parsed = _parse_nasdaq_date(group.strip())
+            if parsed is not None:
+                expiries.append(parsed)
         expiries = sorted(set(expiries))
         if not expiries:
             raise RuntimeError(f"No expiry groups found for {ticker} via Nasdaq")
-        return expiries, url_used
+        return expiries
 
-    def pick_nearest_expiry(self, ticker: str, *, asof: date) -> tuple[date, str]:
-        expiries, url_used = self.get_available_expiries(ticker)
+    def get_available_expiries(self, ticker: str) -> tuple[list[date], str]:
+        data, url_used = self._fetch_option_chain(ticker)
+        return self._expiry_groups(ticker, data), url_used
+
+    def pick_nearest_expiry_with_underlying(self, ticker: str, *, asof: date) -> tuple[date, Optional[float], str]:
+        # The expiry listing is a full option-chain payload, so it carries lastTrade as well.
+        data, url_used = self._fetch_option_chain(ticker)
+        expiries = self._expiry_groups(ticker, data)
         future = [e for e in expiries if e >= asof]
-        if not future:
-            return expiries[-1], url_used
-        return future[0], url_used
+        return (future[0] if future else expiries[-1]), self._parse_last_trade(data), url_used
+
+    def pick_nearest_expiry(self, ticker: str, *, asof: date) -> tuple[date, str]:
+        expiry, _, url_used = self.pick_nearest_expiry_with_underlying(ticker, asof=asof)
+        return expiry, url_used
 
     def get_last_trade_price(self, ticker: str) -> tuple[float, str]:
         url = NASDAQ_QUOTE_URL.format(ticker=ticker.lower())
@@ -343,5 +345,4 @@ class Nasdaq:
         last = info.get("lastSalePrice") or info.get("lastTrade")
         if last is None:
             raise RuntimeError(f"No lastSalePrice in Nasdaq info payload for {ticker}")
-        s = str(last).strip().replace("$", "")
-        return float(s), meta.url
+        return _parse_price(str(last)), meta.url
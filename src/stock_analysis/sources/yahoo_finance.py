@@ -2,13 +2,22 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import json
+import os
 import re
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
 
 from ..dates import epoch_to_exchange_date, parse_ymd, ymd_range_epoch_utc
-from ..http import FetchResult, HttpClient
+from ..http import FetchResult, HttpClient, default_client
 
 
 YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
@@ -18,6 +27,11 @@ YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
 YAHOO_CRUMB_URL_ALT = "https://query2.finance.yahoo.com/v1/test/getcrumb"
 YAHOO_QUOTE_PAGE = "https://finance.yahoo.com/quote/{ticker}"
 
+# The crumb handshake (quote page + getcrumb) is slow and rate-limited, so the crumb and its
+# cookies are shared across processes through a small file cache.
+CRUMB_CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "stock_analysis" / "yahoo.json"
+CRUMB_CACHE_TTL_S = 3600.0
+
 
 @dataclass(frozen=True)
 class CloseQuote:
@@ -43,14 +57,120 @@ class PutPremium:
     urls: List[str]
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
 def _float_eq(a: float, b: float, tol: float = 1e-6) -> bool:
     return abs(a - b) <= tol
 
 
 class YahooFinance:
-    def __init__(self, http: Optional[HttpClient] = None) -> None:
-        self._http = http or HttpClient()
+    def __init__(self, http: Optional[HttpClient] = None, crumb_cache: Optional[Path] = CRUMB_CACHE_PATH) -> None:
+        self._http = http or default_client()
         self._crumb: Optional[str] = None
+        # Pass crumb_cache=None to keep the crumb in memory only.
+        self._crumb_cache = crumb_cache
+        self._load_crumb()
+
+    def _load_crumb(self) -> None:
+        if self._crumb_cache is None:
+            return
+        try:
+            text = self._crumb_cache.read_text()
+        except OSError:
+            return
+        now = time.time()
+        try:
+            saved = json.loads(text)
+            if float(saved["expires_at"]) <= now:
+                return
+            crumb = str(saved["crumb"])
+            restored = []
+            for c in saved.get("cookies") or []:
+                expires = c.get("expires")
+                if expires is not None and expires <= now:
+                    continue
+                restored.append(
+                    (
+                        str(c["name"]),
+                        str(c["value"]),
+                        {
+                            "domain": c.get("domain", ""),
+                            "path": c.get("path", "/"),
+                            "expires": expires,
+                            "secure": bool(c.get("secure", False)),
+                        },
+                    )
+                )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # A corrupt cache is a miss; drop it so the next handshake rewrites it.
+            self._invalidate_crumb()
+            return
+        for name, value, attrs in restored:
+            self._http.cookies.set(name, value, **attrs)
+        self._crumb = crumb
+
+    def _store_crumb(self, crumb: str) -> None:
+        self._crumb = crumb
+        path = self._crumb_cache
+        if path is None:
+            return
+        payload = {
+            "crumb": crumb,
+            "cookies": [
+                {
+                    "name": c.name,
+                    "value": c.value,
+                    "domain": c.domain,
+                    "path": c.path,
+                    "expires": c.expires,
+                    "secure": c.secure,
+                }
+                for c in self._http.cookies
+                if "yahoo.com" in c.domain
+            ],
+            "expires_at": time.time() + CRUMB_CACHE_TTL_S,
+        }
+        # Best effort: a failed write only costs the next process a fresh handshake.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path.with_name(path.name + ".lock"), "w") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        json.dump(payload, f)
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+        except OSError:
+            pass
+
+    def _invalidate_crumb(self) -> None:
+        # Yahoo rejected the crumb (or its cookies); make sure neither this process nor the next
+        # one reuses it.
+        self._crumb = None
+        if self._crumb_cache is not None:
+            try:
+                self._crumb_cache.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _get_options_json(self, ticker: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], FetchResult]:
+        url = YAHOO_OPTIONS_URL.format(ticker=ticker)
+        crumb = self._ensure_crumb(ticker)
+        try:
+            return self._http.get_json(url, params={**params, "crumb": crumb})
+        except RuntimeError as e:
+            msg = str(e)
+            if "HTTP 401" not in msg and "HTTP 403" not in msg:
+                raise
+        # A cached crumb can be revoked before its TTL; redo the handshake once and retry.
+        self._invalidate_crumb()
+        crumb = self._ensure_crumb(ticker)
+        return self._http.get_json(url, params={**params, "crumb": crumb})
 
     def _ensure_crumb(self, ticker_for_cookies: str) -> str:
         if self._crumb:
@@ -74,31 +194,23 @@ class YahooFinance:
                     crumb = raw
                 crumb = (crumb or "").strip()
                 if crumb and "<" not in crumb:
-                    self._crumb = crumb
+                    self._store_crumb(crumb)
                     return crumb
 
-        # Fallback: call getcrumb.
+        # Fallback: call getcrumb. HttpClient already retries 429s (honouring Retry-After).
         last_err: Optional[Exception] = None
         for crumb_url in (YAHOO_CRUMB_URL, YAHOO_CRUMB_URL_ALT):
-            for attempt in range(1, 6):
-                try:
-                    crumb_text, _ = self._http.get_text(crumb_url)
-                    crumb = (crumb_text or "").strip()
-                    if crumb and "<" not in crumb:
-                        self._crumb = crumb
-                        return crumb
-                    snippet = re.sub(r"\s+", " ", (crumb_text or ""))[:120]
-                    raise RuntimeError(f"Unexpected crumb payload (got: {snippet!r})")
-                except Exception as e:  # noqa: BLE001
-                    last_err = e
-                    # If we're being throttled, wait longer.
-                    msg = str(e)
-                    if "HTTP 429" in msg or "Too Many Requests" in msg:
-                        import time
-
-                        time.sleep(1.5 * attempt)
-                        continue
-                    break
+            try:
+                crumb_text, _ = self._http.get_text(crumb_url)
+            except Exception as e:  # noqa: BLE001
+                last_err = e
+                continue
+            crumb = (crumb_text or "").strip()
+            if crumb and "<" not in crumb:
+                self._store_crumb(crumb)
+                return crumb
+            snippet = re.sub(r"\s+", " ", (crumb_text or ""))[:120]
+            last_err = RuntimeError(f"Unexpected crumb payload (got: {snippet!r})")
 
         raise RuntimeError(f"Failed to obtain Yahoo crumb token: {last_err}")
 
@@ -114,26 +226,18 @@ class YahooFinance:
             "includeAdjustedClose": "true",
         }
 
+        # HttpClient retries 429s itself; if the primary host stays throttled, try the alternate.
         last_err: Optional[Exception] = None
         for url_tmpl in (YAHOO_CHART_URL, YAHOO_CHART_URL_ALT):
-            url = url_tmpl.format(ticker=ticker)
-            for attempt in range(1, 4):
-                try:
-                    data, meta = self._http.get_json(url, params=params)
-                    break
-                except Exception as e:  # noqa: BLE001
+            try:
+                data, meta = self._http.get_json(url_tmpl.format(ticker=ticker), params=params)
+                break
+            except Exception as e:  # noqa: BLE001
+                msg = str(e)
+                if "HTTP 429" in msg or "Too Many Requests" in msg:
                     last_err = e
-                    msg = str(e)
-                    if "HTTP 429" in msg or "Too Many Requests" in msg:
-                        import time
-
-                        time.sleep(1.2 * attempt)
-                        continue
-                    raise
-            else:
-                continue
-            # succeeded
-            break
+                    continue
+                raise
         else:
             raise RuntimeError(f"Yahoo chart fetch failed: {last_err}")
 
@@ -176,31 +280,28 @@ class YahooFinance:
 
     def _get_expiration_epoch(self, ticker: str, expiry: date) -> Tuple[int, List[str]]:
         # First call without date to discover available expirations.
-        url = YAHOO_OPTIONS_URL.format(ticker=ticker)
-        crumb = self._ensure_crumb(ticker)
-        data, meta = self._http.get_json(url, params={"crumb": crumb})
+        data, meta = self._get_options_json(ticker, {})
         chain = (((data.get("optionChain") or {}).get("result") or [None])[0]) or {}
         exp_epochs: List[int] = chain.get("expirationDates") or []
 
         if not exp_epochs:
             raise RuntimeError(f"No expirationDates returned for {ticker} from Yahoo")
 
-        # Yahoo epochs are seconds since epoch (UTC). Match by UTC date.
-        matches = [e for e in exp_epochs if date.fromtimestamp(e) == expiry]
-        if matches:
-            return matches[0], [meta.url]
+        # Yahoo epochs are seconds since epoch (UTC). Match by UTC date with integer day numbers.
+        expiry_day = expiry.toordinal() - _EPOCH_ORDINAL
+        for e in exp_epochs:
+            if e // 86400 == expiry_day:
+                return e, [meta.url]
 
         # If exact date isn't found, pick the nearest as a helpful fallback.
-        nearest = min(exp_epochs, key=lambda e: abs((date.fromtimestamp(e) - expiry).days))
+        expiry_epoch = expiry_day * 86400
+        nearest = min(exp_epochs, key=lambda e: abs(e - expiry_epoch))
         return nearest, [meta.url]
 
     def get_put_premium(self, ticker: str, expiry: date, strike: float) -> PutPremium:
         exp_epoch, urls = self._get_expiration_epoch(ticker, expiry)
 
-        crumb = self._ensure_crumb(ticker)
-
-        url = YAHOO_OPTIONS_URL.format(ticker=ticker)
-        data, meta = self._http.get_json(url, params={"date": exp_epoch, "crumb": crumb})
+        data, meta = self._get_options_json(ticker, {"date": exp_epoch})
         urls = urls + [meta.url]
 
         chain = (((data.get("optionChain") or {}).get("result") or [None])[0]) or {}
@@ -213,21 +314,22 @@ class YahooFinance:
         if not puts:
             raise RuntimeError(f"No puts returned for {ticker} {expiry} from Yahoo")
 
-        chosen: Optional[Dict[str, Any]] = None
+        # Index by strike in thousandths; the tolerance scan only runs if the exact lookup misses.
+        by_strike: Dict[int, Dict[str, Any]] = {}
         for p in puts:
-            p_strike = p.get("strike")
-            if p_strike is None:
-                continue
             try:
-                p_strike_f = float(p_strike)
-            except (TypeError, ValueError):
+                by_strike.setdefault(round(float(p["strike"]) * 1000), p)
+            except (KeyError, TypeError, ValueError):
                 continue
-            if _float_eq(p_strike_f, float(strike), tol=1e-3):
-                chosen = p
-                break
+        chosen: Optional[Dict[str, Any]] = by_strike.get(round(float(strike) * 1000))
+        if chosen is None:
+            for p in by_strike.values():
+                if _float_eq(float(p["strike"]), float(strike), tol=1e-3):
+                    chosen = p
+                    break
 
         if chosen is None:
-            strikes = sorted({float(p.get("strike")) for p in puts if p.get("strike") is not None})
+            strikes = sorted(float(p["strike"]) for p in by_strike.values())
             raise RuntimeError(
                 f"No put with strike {strike} found for {ticker} {expiry} via Yahoo. "
                 f"Example strikes: {strikes[:15]}"
@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from stock_analysis.api import _BATCH_MAX_ITEMS, BatchItem, _dispatch, app
+
+
+@pytest.mark.parametrize(
+    "op, params",
+    [
+        ("price", {"ticker": "META", "bogus": 1}),
+        ("delta_strike", {"ticker": "META", "spot": 100, "expiry": "2026-02-13", "chain": []}),
+        ("delta_strike", {"ticker": "META", "spot": 100, "expiry": "2026-02-13", "chain_url": "x"}),
+        ("option_premium", {"ticker": "META", "expiry": "2026-99-13", "strike": 95}),
+        ("strike_premium", {"ticker": "META", "target_delta": 0.2, "right": "straddle"}),
+    ],
+)
+def test_batch_rejects_invalid_params(op: str, params: dict) -> None:
+    with pytest.raises(ValidationError):
+        _dispatch(BatchItem(op=op, params=params))
+
+
+def test_batch_rejects_more_than_max_items() -> None:
+    client = TestClient(app)
+    items = [{"op": "price", "params": {"ticker": "META", "bogus": 1}}] * (_BATCH_MAX_ITEMS + 1)
+    resp = client.post("/batch", json=items)
+    assert resp.status_code == 422
+
+    # At the limit the batch runs; these items fail validation individually without any fetch.
+    resp = client.post("/batch", json=items[:_BATCH_MAX_ITEMS])
+    assert resp.status_code == 200
+    assert len(resp.json()) == _BATCH_MAX_ITEMS
+
+
+def test_date_params_keep_date_format_in_openapi() -> None:
+    params = {p["name"]: p["schema"] for p in app.openapi()["paths"]["/delta-strike"]["get"]["parameters"]}
+    assert params["expiry"]["format"] == "date"
+    assert {"type": "string", "format": "date"} in params["asof"]["anyOf"]
+
+
+def test_bad_date_returns_standard_validation_error() -> None:
+    resp = TestClient(app).get("/delta-strike", params={"ticker": "META", "spot": 100, "expiry": "2026-13-01"})
+    assert resp.status_code == 422
+    (err,) = resp.json()["detail"]
+    assert err["loc"] == ["query", "expiry"]
+    assert err["type"] == "value_error"
@@ -0,0 +1,135 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+import pytest
+
+from stock_analysis import engine as engine_mod
+from stock_analysis.engine import OptionEngine, Right, _pick_scalar
+from stock_analysis.options_math import (
+    BsCtx,
+    _bs_call_delta_fast,
+    _bs_put_delta_fast,
+    _implied_vol_newton_fast,
+    bs_call_price_raw,
+    bs_put_price_raw,
+)
+
+ASOF = date(2024, 1, 2)
+
+
+def _noisy_chain(rng: random.Random, ctx: BsCtx, right: Right) -> list[dict]:
+    price = bs_put_price_raw if right is Right.PUT else bs_call_price_raw
+    step = rng.choice([0.5, 1.0, 2.5, 5.0])
+    lo = math.floor(ctx.s * 0.5 / step) * step
+    rows = []
+    k = lo
+    while k <= ctx.s * 1.5:
+        if k > 0:
+            vol = 0.25 + 0.3 * abs(math.log(k / ctx.s)) + rng.uniform(-0.02, 0.02)
+            mid = round(price(ctx.s, k, ctx.t, ctx.r, ctx.q, vol), 2)
+            if mid > 0:
+                rows.append({"strike": k, "mid": mid})
+        k += step
+    return rows
+
+
+def _full_scan(rows: list[dict], ctx: BsCtx, right: Right, target: float) -> int:
+    is_put = right is Right.PUT
+    delta_fast = _bs_put_delta_fast if is_put else _bs_call_delta_fast
+    best_i, best_diff = -1, math.inf
+    for i, row in enumerate(rows):
+        k = float(row["strike"])
+        log_fk = ctx.log_f - math.log(k)
+        iv = _implied_vol_newton_fast(log_fk, ctx.sqrt_t, ctx.pv_s, k * ctx.disc_r, row["mid"], is_put)
+        if iv is None:
+            continue
+        diff = abs(delta_fast(log_fk, ctx.sqrt_t, ctx.disc_q, iv) - target)
+        if diff < best_diff:
+            best_i, best_diff = i, diff
+    return best_i
+
+
+@pytest.mark.parametrize("right", [Right.PUT, Right.CALL])
+def test_pick_scalar_matches_full_scan_on_noisy_chains(right: Right) -> None:
+    rng = random.Random(1234 + int(right))
+    for _ in range(200):
+        s = rng.uniform(20.0, 500.0)
+        days = rng.choice([3, 7, 14, 30, 60, 120])
+        ctx = BsCtx.from_inputs(s, ASOF, date.fromordinal(ASOF.toordinal() + days), r=0.04, q=0.01)
+        target = -rng.uniform(0.05, 0.5) if right is Right.PUT else rng.uniform(0.05, 0.5)
+        rows = _noisy_chain(rng, ctx, right)
+
+        pick = _pick_scalar(rows, ctx, right, target)
+        assert pick is not None
+        assert pick.i == _full_scan(rows, ctx, right, target)
+
+
+class _BrokenPool:
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self.shut_down = True
+
+
+def test_broken_score_pool_is_reset_and_chain_scored_in_process(monkeypatch) -> None:
+    monkeypatch.setattr(engine_mod, "_vector_solver", lambda: None)
+    eng = OptionEngine(score_workers=2)
+    broken = _BrokenPool()
+    eng._pool = broken
+
+    expiry = date(2024, 2, 2)
+    ctx = BsCtx.from_inputs(100.0, ASOF, expiry)
+    chain = [
+        {"strike": float(k), "mid": round(bs_put_price_raw(100.0, k, ctx.t, 0.0, 0.0, 0.3), 2)}
+        for k in range(50, 150)
+    ]
+    res = eng.find_strike_for_delta(
+        ticker="x", expiry=expiry, target_delta=-0.25, asof=ASOF, spot=100.0, chain=chain, chain_url="u"
+    )
+
+    assert broken.shut_down
+    assert eng._pool is None
+    assert res["strike"] == chain[_pick_scalar(chain, ctx, Right.PUT, -0.25).i]["strike"]
+
+
+class _SlowSpotNasdaq:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def get_underlying_from_option_chain(self, ticker: str) -> tuple[float, str]:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait(5)
+        with self.lock:
+            self.active -= 1
+        return 100.0, f"u://{ticker}"
+
+
+def test_upstream_limit_caps_fetches_but_not_cache_hits() -> None:
+    nasdaq = _SlowSpotNasdaq()
+    eng = OptionEngine(nasdaq=nasdaq, upstream_limit=2)
+    eng._spot_cache["HIT"] = (50.0, "u://hit")
+
+    with ThreadPoolExecutor(6) as ex:
+        futs = [ex.submit(eng.get_latest_price, f"T{i}") for i in range(6)]
+        while nasdaq.active < 2:
+            time.sleep(0.001)
+        # Slots are full of blocked fetches; a cached lookup must still return straight away.
+        assert eng.get_latest_price("HIT")["price"] == 50.0
+        assert not nasdaq.release.is_set()
+        nasdaq.release.set()
+        assert [f.result(timeout=5)["price"] for f in futs] == [100.0] * 6
+
+    assert nasdaq.peak == 2
@@ -0,0 +1,69 @@
+import pytest
+
+from stock_analysis.http import FetchResult, HttpStatusError
+from stock_analysis.sources.nasdaq import Nasdaq
+
+
+class _FakeHttp:
+    def __init__(self, info: dict, chain: dict | None = None) -> None:
+        self._info = info
+        self._chain = chain or {}
+
+    def get_json(self, url, *, params=None):
+        payload = self._info if url.endswith("/info") else self._chain
+        return payload, FetchResult(url, 200, 0.0)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [("$82.25", 82.25), ("$1,234.56", 1234.56), (" $12,345 ", 12345.0), ("417.1", 417.1)],
+)
+def test_last_trade_price_parses_dollar_and_comma_formats(raw: str, expected: float) -> None:
+    nasdaq = Nasdaq(http=_FakeHttp({"data": {"primaryData": {"lastSalePrice": raw}}}))
+    price, _ = nasdaq.get_last_trade_price("BKNG")
+    assert price == expected
+
+
+def test_chain_last_trade_parses_comma_formatted_price() -> None:
+    data = {"data": {"lastTrade": "LAST TRADE: $4,012.5 (AS OF FEB 6, 2026)"}}
+    assert Nasdaq._parse_last_trade(data) == 4012.5
+    assert Nasdaq._parse_last_trade({"data": {"lastTrade": "N/A (AS OF FEB 6, 2026)"}}) is None
+
+
+def test_unparseable_info_price_falls_back_to_chain() -> None:
+    http = _FakeHttp(
+        {"data": {"primaryData": {"lastSalePrice": "N/A"}}},
+        {"data": {"lastTrade": "LAST TRADE: $1,001.25 (AS OF FEB 6, 2026)", "table": {"rows": []}}},
+    )
+    price, _ = Nasdaq(http=http).get_underlying_from_option_chain("BKNG")
+    assert price == 1001.25
+
+
+class _StatusHttp(_FakeHttp):
+    def __init__(self, status: int) -> None:
+        super().__init__({}, {"data": {"lastTrade": "LAST TRADE: $10.5 (AS OF FEB 6, 2026)", "table": {"rows": []}}})
+        self._status = status
+        self.urls: list[str] = []
+
+    def get_json(self, url, *, params=None):
+        self.urls.append(url)
+        if url.endswith("/info"):
+            raise HttpStatusError(self._status, url, "")
+        return super().get_json(url, params=params)
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_throttled_or_failing_info_does_not_fall_back_to_chain(status: int) -> None:
+    http = _StatusHttp(status)
+    with pytest.raises(HttpStatusError) as exc:
+        Nasdaq(http=http).get_underlying_from_option_chain("BKNG")
+    assert exc.value.status_code == status
+    assert len(http.urls) == 1
+
+
+@pytest.mark.parametrize("status", [400, 404])
+def test_no_data_info_falls_back_to_chain(status: int) -> None:
+    http = _StatusHttp(status)
+    price, _ = Nasdaq(http=http).get_underlying_from_option_chain("BKNG")
+    assert price == 10.5
+    assert len(http.urls) == 2
@@ -0,0 +1,121 @@
+import math
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+nb = pytest.importorskip("stock_analysis.options_math_numba")
+np = pytest.importorskip("numpy")
+
+from stock_analysis.options_math import (
+    bs_call_delta_raw,
+    bs_call_price_raw,
+    bs_put_delta_raw,
+    bs_put_price_raw,
+    implied_vol_call_raw,
+    implied_vol_put_raw,
+)
+
+# (s, k, t, sigma): ATM, deep ITM/OTM on either side, and a couple of very short expiries.
+CASES = [
+    (100.0, 100.0, 0.25, 0.30),
+    (100.0, 40.0, 0.50, 0.35),
+    (100.0, 250.0, 0.50, 0.35),
+    (100.0, 70.0, 0.10, 0.60),
+    (100.0, 140.0, 0.10, 0.60),
+    (100.0, 100.0, 2.0 / 365.0, 0.25),
+    (100.0, 97.0, 1.0 / 365.0, 0.40),
+]
+R, Q = 0.04, 0.01
+
+
+@pytest.mark.parametrize("s, k, t, sig", CASES)
+def test_prices_and_deltas_match_python(s: float, k: float, t: float, sig: float) -> None:
+    assert nb.bs_put_price_nb(s, k, t, R, Q, sig) == pytest.approx(bs_put_price_raw(s, k, t, R, Q, sig), rel=1e-9, abs=1e-12)
+    assert nb.bs_call_price_nb(s, k, t, R, Q, sig) == pytest.approx(bs_call_price_raw(s, k, t, R, Q, sig), rel=1e-9, abs=1e-12)
+    assert nb.bs_put_delta_nb(s, k, t, R, Q, sig) == pytest.approx(bs_put_delta_raw(s, k, t, R, Q, sig), rel=1e-9, abs=1e-12)
+    assert nb.bs_call_delta_nb(s, k, t, R, Q, sig) == pytest.approx(bs_call_delta_raw(s, k, t, R, Q, sig), rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize("s, k, t, sig", CASES)
+def test_implied_vol_matches_python(s: float, k: float, t: float, sig: float) -> None:
+    for price, solve_nb, solve_py in (
+        (bs_put_price_raw, nb.implied_vol_put_nb, implied_vol_put_raw),
+        (bs_call_price_raw, nb.implied_vol_call_nb, implied_vol_call_raw),
+    ):
+        target = round(price(s, k, t, R, Q, sig), 2)
+        expected = solve_py(s, k, t, R, Q, target)
+        got = solve_nb(s, k, t, R, Q, target)
+        if expected is None:
+            assert math.isnan(got)
+        else:
+            assert got == pytest.approx(expected, abs=1e-6)
+
+
+def test_implied_vol_rejects_out_of_bounds_prices() -> None:
+    # Below intrinsic and above the discounted strike have no solution.
+    assert math.isnan(nb.implied_vol_put_nb(100.0, 150.0, 0.5, R, Q, 10.0))
+    assert math.isnan(nb.implied_vol_put_nb(100.0, 50.0, 0.5, R, Q, 60.0))
+    assert math.isnan(nb.implied_vol_call_nb(100.0, 100.0, 0.0, R, Q, 5.0))
+
+
+@pytest.mark.parametrize("is_put", [True, False])
+def test_serial_and_parallel_chains_match_python(is_put: bool) -> None:
+    s, t = 100.0, 30.0 / 365.0
+    price = bs_put_price_raw if is_put else bs_call_price_raw
+    solve_py = implied_vol_put_raw if is_put else implied_vol_call_raw
+    delta_py = bs_put_delta_raw if is_put else bs_call_delta_raw
+    target = -0.25 if is_put else 0.25
+    for n in (nb._PARALLEL_MIN // 2, nb._PARALLEL_MIN * 4):
+        k = np.linspace(50.0, 150.0, n)
+        mid = np.array([round(price(s, kk, t, R, Q, 0.3 + 0.4 * math.log(kk / s) ** 2), 2) for kk in k])
+        i_best, iv, delta = nb.solve_chain(s, k, t, R, Q, mid, target, is_put=is_put)
+
+        best_i, best_diff = -1, math.inf
+        for i, (kk, m) in enumerate(zip(k, mid)):
+            sig = solve_py(s, kk, t, R, Q, m)
+            if sig is None:
+                assert math.isnan(iv[i])
+                continue
+            assert iv[i] == pytest.approx(sig, abs=1e-6)
+            d = delta_py(s, kk, t, R, Q, sig)
+            assert delta[i] == pytest.approx(d, abs=1e-6)
+            if abs(d - target) < best_diff:
+                best_i, best_diff = i, abs(d - target)
+        assert i_best == best_i
+
+
+_CONCURRENT_SCRIPT = """
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from stock_analysis import options_math_numba as nb
+
+k = np.linspace(50.0, 150.0, 400)
+mid = np.full(400, 1.0)
+with ThreadPoolExecutor(8) as ex:
+    picks = set(ex.map(lambda _: nb.solve_chain(100.0, k, 0.1, 0.0, 0.0, mid, -0.2, is_put=True)[0], range(64)))
+assert len(picks) == 1, picks
+"""
+
+
+def test_solve_chain_from_concurrent_threads() -> None:
+    k = np.linspace(50.0, 150.0, 400)
+    mid = np.array([round(bs_put_price_raw(100.0, kk, 0.1, R, Q, 0.3), 2) for kk in k])
+    expected = nb.solve_chain(100.0, k, 0.1, R, Q, mid, -0.2, is_put=True)
+    with ThreadPoolExecutor(8) as ex:
+        results = list(ex.map(lambda _: nb.solve_chain(100.0, k, 0.1, R, Q, mid, -0.2, is_put=True), range(64)))
+    for i_best, iv, delta in results:
+        assert i_best == expected[0]
+        np.testing.assert_array_equal(iv, expected[1])
+
+
+def test_solve_chain_from_concurrent_threads_on_workqueue_layer() -> None:
+    # workqueue aborts the process on concurrent parallel launches, so this runs in a child.
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [*sys.path, env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-c", _CONCURRENT_SCRIPT], env=env, capture_output=True, timeout=300, check=False
+    )
+    assert proc.returncode == 0, proc.stderr.decode()[-2000:]
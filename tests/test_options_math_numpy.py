@@ -0,0 +1,28 @@
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+npm = pytest.importorskip("stock_analysis.options_math_numpy")
+
+from stock_analysis.options_math import bs_put_price_raw, implied_vol_put_raw
+
+
+@pytest.mark.parametrize("s, t", [(0.0, 0.1), (-5.0, 0.1), (100.0, 0.0)])
+def test_degenerate_spot_or_expiry_gives_all_nan(s: float, t: float) -> None:
+    k = np.array([90.0, 100.0, 110.0])
+    mid = np.array([1.0, 2.0, 3.0])
+    iv, delta = npm.solve_iv_delta(s, k, t, 0.0, 0.0, mid, is_put=True)
+    assert np.isnan(iv).all() and np.isnan(delta).all()
+    assert npm.solve_chain(s, k, t, 0.0, 0.0, mid, -0.2, is_put=True)[0] == -1
+
+
+def test_non_positive_strikes_are_masked_like_missing_mids() -> None:
+    s, t = 100.0, 0.25
+    k = np.array([0.0, -10.0, 95.0, 100.0])
+    mid = np.array([1.0, 1.0, 0.0, round(bs_put_price_raw(s, 100.0, t, 0.0, 0.0, 0.3), 2)])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        iv, delta = npm.solve_iv_delta(s, k, t, 0.0, 0.0, mid, is_put=True)
+    assert np.isnan(iv[:3]).all() and np.isnan(delta[:3]).all()
+    assert iv[3] == pytest.approx(implied_vol_put_raw(s, 100.0, t, 0.0, 0.0, mid[3]), abs=1e-6)
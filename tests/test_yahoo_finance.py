@@ -0,0 +1,113 @@
+import json
+import time
+from datetime import date
+
+import pytest
+from requests.cookies import RequestsCookieJar
+
+from stock_analysis.http import FetchResult
+from stock_analysis.sources.yahoo_finance import YahooFinance
+
+_EXPIRY_EPOCH = (date(2026, 2, 20).toordinal() - date(1970, 1, 1).toordinal()) * 86400
+
+
+class _FakeHttp:
+    def __init__(self, crumbs: list[str], rejected: set[str]) -> None:
+        self.cookies = RequestsCookieJar()
+        self._crumbs = crumbs
+        self._rejected = rejected
+        self.handshakes = 0
+        self.crumbs_sent: list[str] = []
+
+    def get_text(self, url, *, params=None):
+        crumb = self._crumbs[self.handshakes]
+        self.handshakes += 1
+        self.cookies.set("A3", f"v{self.handshakes}", domain=".yahoo.com", path="/", secure=True)
+        return f'<script>"CrumbStore":{{"crumb":"{crumb}"}}</script>', FetchResult(url, 200, 0.0)
+
+    def get_json(self, url, *, params=None):
+        crumb = params["crumb"]
+        self.crumbs_sent.append(crumb)
+        if crumb in self._rejected:
+            raise RuntimeError(f"HTTP 401 for {url}: Invalid Crumb")
+        data = {"optionChain": {"result": [{"expirationDates": [_EXPIRY_EPOCH]}]}}
+        return data, FetchResult(url, 200, 0.0)
+
+
+def _write_cache(path, crumb: str, cookies: list[dict]) -> None:
+    path.write_text(json.dumps({"crumb": crumb, "cookies": cookies, "expires_at": time.time() + 600}))
+
+
+def test_rejected_cached_crumb_is_dropped_and_handshake_redone(tmp_path) -> None:
+    cache = tmp_path / "yahoo.json"
+    _write_cache(cache, "stale", [])
+    http = _FakeHttp(crumbs=["fresh"], rejected={"stale"})
+
+    yf = YahooFinance(http=http, crumb_cache=cache)
+    epoch, _ = yf._get_expiration_epoch("META", date(2026, 2, 20))
+
+    assert epoch == _EXPIRY_EPOCH
+    assert http.crumbs_sent == ["stale", "fresh"]
+    assert http.handshakes == 1
+    assert json.loads(cache.read_text())["crumb"] == "fresh"
+
+
+def test_crumb_rejected_twice_raises(tmp_path) -> None:
+    http = _FakeHttp(crumbs=["a", "b"], rejected={"a", "b"})
+    yf = YahooFinance(http=http, crumb_cache=tmp_path / "yahoo.json")
+
+    with pytest.raises(RuntimeError, match="HTTP 401"):
+        yf._get_expiration_epoch("META", date(2026, 2, 20))
+    assert http.crumbs_sent == ["a", "b"]
+
+
+def test_cookie_expiry_and_secure_round_trip(tmp_path) -> None:
+    cache = tmp_path / "yahoo.json"
+    http = _FakeHttp(crumbs=["c"], rejected=set())
+    YahooFinance(http=http, crumb_cache=cache)._ensure_crumb("META")
+    saved = json.loads(cache.read_text())["cookies"]
+    assert saved[0]["secure"] is True
+
+    now = time.time()
+    _write_cache(
+        cache,
+        "c",
+        [
+            {"name": "live", "value": "1", "domain": ".yahoo.com", "path": "/", "expires": int(now + 600), "secure": True},
+            {"name": "gone", "value": "2", "domain": ".yahoo.com", "path": "/", "expires": int(now - 1), "secure": False},
+        ],
+    )
+    http = _FakeHttp(crumbs=[], rejected=set())
+    YahooFinance(http=http, crumb_cache=cache)
+
+    cookies = {c.name: c for c in http.cookies}
+    assert set(cookies) == {"live"}
+    assert cookies["live"].secure
+    assert cookies["live"].expires == int(now + 600)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"crumb": "c", "expires_at": "soon"}),
+        json.dumps({"crumb": "c", "expires_at": time.time() + 600, "cookies": "A3=v"}),
+        json.dumps({"crumb": "c", "expires_at": time.time() + 600, "cookies": ["A3=v"]}),
+        json.dumps({"crumb": "c", "expires_at": time.time() + 600, "cookies": [{"value": "v"}]}),
+        json.dumps({"crumb": "c", "expires_at": time.time() + 600, "cookies": [{"name": "A3", "value": "v", "expires": "x"}]}),
+    ],
+)
+def test_malformed_crumb_cache_is_a_miss(tmp_path, payload: str) -> None:
+    cache = tmp_path / "yahoo.json"
+    cache.write_text(payload)
+    http = _FakeHttp(crumbs=["fresh"], rejected=set())
+
+    yf = YahooFinance(http=http, crumb_cache=cache)
+    assert not cache.exists()
+    assert len(http.cookies) == 0
+
+    epoch, _ = yf._get_expiration_epoch("META", date(2026, 2, 20))
+    assert epoch == _EXPIRY_EPOCH
+    assert http.crumbs_sent == ["fresh"]
+    assert json.loads(cache.read_text())["crumb"] == "fresh"